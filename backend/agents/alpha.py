@@ -3,7 +3,7 @@ from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, ModuleConfig
 
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class AlphaAgent(BaseAgent):
     """
@@ -14,20 +14,20 @@ class AlphaAgent(BaseAgent):
         super().__init__("agent_alpha", bus)
         # Arsenal stripped. Alpha acts as a pure structural mapper.
         # Hybrid AI Engine for intelligent classification
-        self.cortex = CortexEngine()
+        self.cortex = CortexHandle(self.name)
         self.MAX_CRAWL_DEPTH = 5
 
     async def setup(self):
         # Listen for assigned jobs
-        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job)
+        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job, route_key=AgentID.ALPHA)
 
     async def handle_job(self, event: HiveEvent):
         """
         Process incoming job.
         """
-        payload = event.payload
         try:
-            packet = JobPacket(**payload)
+            # Validated once by the bus-side router; shared across consumers
+            packet = event.job_packet()
         except Exception as e:
             print(f"[{self.name}] Error parsing job: {e}")
             return
@@ -58,7 +58,10 @@ class AlphaAgent(BaseAgent):
         print(f"[{self.name}] Received Job {packet.id} ({packet.config.module_id})")
         
         # 1. HYBRID AI: Intelligent Target Classification
-        classification = await self.cortex.classify_target(packet.target.url)
+        classification = await self.cortex.classify_target(
+            packet.target.url,
+            on_correction=self.correction_handler("classify_target", {"url": packet.target.url}),
+        )
         is_api = classification.get("is_api", False)
         
         # Fallback: Hardcoded indicators still checked
@@ -144,4 +147,4 @@ class AlphaAgent(BaseAgent):
             type=EventType.JOB_ASSIGNED,
             source=self.name,
             payload=sigma_job.model_dump()
-        ))
+        ), throttle=True)
@@ -3,7 +3,7 @@ import random
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, TaskPriority, ModuleConfig, TaskTarget
 
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 import json
 
 class BetaAgent(BaseAgent):
@@ -20,7 +20,7 @@ class BetaAgent(BaseAgent):
         
         # CORTEX AI Integration (Local Ollama)
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
 
@@ -33,7 +33,7 @@ class BetaAgent(BaseAgent):
         ]
 
     async def setup(self):
-        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job)
+        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job, route_key=AgentID.BETA)
         self.bus.subscribe(EventType.VULN_CANDIDATE, self.handle_candidate)
         self.bus.subscribe(EventType.JOB_COMPLETED, self.handle_sigma_payloads)
 
@@ -71,9 +71,8 @@ class BetaAgent(BaseAgent):
             await self._execute_packet(packet)
 
     async def handle_job(self, event: HiveEvent):
-        payload = event.payload
         try:
-            packet = JobPacket(**payload)
+            packet = event.job_packet()
         except: return
 
         if packet.config.agent_id != AgentID.BETA:
@@ -6,7 +6,7 @@ from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, TaskPriority, ModuleConfig
 from backend.core.hyper_hive import negotiator
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class GammaAgent(BaseAgent):
     """
@@ -20,10 +20,11 @@ class GammaAgent(BaseAgent):
         super().__init__("agent_gamma", bus)
         # Arsenal stripped. Gamma is now purely a tactical router.
         # Hybrid AI Engine for anomaly classification
-        self.cortex = CortexEngine()
+        self.cortex = CortexHandle(self.name)
 
     async def setup(self):
-        self.bus.subscribe(EventType.VULN_CANDIDATE, self.audit_candidate)
+        # LLM-bound: cap in-flight audits so Gamma can't hog the Ollama slots
+        self.bus.subscribe(EventType.VULN_CANDIDATE, self.audit_candidate, max_concurrency=2)
 
     async def audit_candidate(self, event: HiveEvent):
         """
@@ -38,24 +39,33 @@ class GammaAgent(BaseAgent):
         if self.cortex and self.cortex.enabled:
             try:
                 # CortexEngine.audit_candidate uses Self-Consistency Pass and Deterministic Overrides
-                verdict = await self.cortex.audit_candidate(payload)
-                confidence = verdict.get('confidence', 0.5)
-                is_real = verdict.get('is_real', True)
-                reason = verdict.get('reasoning', 'N/A')
-                print(f"[{self.name}] [AI AUDIT] Real={is_real} Confidence={confidence:.1f} Reason={reason}")
-                
-                if not is_real and confidence > 0.7:
-                    print(f"[{self.name}] [AI AUDIT] FALSE POSITIVE suppressed by Gamma.")
-                    return
-                
-                # If verified, trigger VULN_CONFIRMED for Kappa to archive
-                if is_real:
-                     payload["confidence"] = confidence
-                     payload["audit_reasoning"] = reason
-                     await self.bus.publish(HiveEvent(
-                         type=EventType.VULN_CONFIRMED,
-                         source=self.name,
-                         payload=payload
-                     ))
+                # V7: A speculative GI5 verdict may be overturned later; a late "real" still confirms
+                verdict = await self.cortex.audit_candidate(
+                    payload,
+                    on_correction=self.correction_handler(
+                        "audit_candidate", {"url": payload.get("url")},
+                        on_refined=lambda refined: self._apply_verdict(payload, refined),
+                    ),
+                )
+                await self._apply_verdict(payload, verdict)
             except Exception as e:
                 print(f"[{self.name}] [AI AUDIT] CortexEngine error: {e}")
+
+    async def _apply_verdict(self, payload: dict, verdict: dict):
+        confidence = verdict.get('confidence', 0.5)
+        is_real = verdict.get('is_real', True)
+        reason = verdict.get('reasoning', 'N/A')
+        print(f"[{self.name}] [AI AUDIT] Real={is_real} Confidence={confidence:.1f} Reason={reason}")
+        
+        if not is_real and confidence > 0.7:
+            print(f"[{self.name}] [AI AUDIT] FALSE POSITIVE suppressed by Gamma.")
+            return
+        
+        # If verified, trigger VULN_CONFIRMED for Kappa to archive
+        if is_real:
+             payload = dict(payload, confidence=confidence, audit_reasoning=reason)
+             await self.bus.publish(HiveEvent(
+                 type=EventType.VULN_CONFIRMED,
+                 source=self.name,
+                 payload=payload
+             ))
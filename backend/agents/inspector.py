@@ -6,7 +6,7 @@ import asyncio
 from typing import Dict, List, Any
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, Vulnerability, TaskPriority
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class AgentIota(BaseAgent):
     """
@@ -21,7 +21,7 @@ class AgentIota(BaseAgent):
         
         # CORTEX AI (Local Ollama)
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
         
@@ -37,15 +37,14 @@ class AgentIota(BaseAgent):
 
     async def setup(self):
         # Subscribe to new jobs (from Defense API)
-        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job)
+        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job, route_key=AgentID.IOTA)
 
     async def handle_job(self, event: HiveEvent):
         """
         Process incoming Intercepted Event (Click/Request).
         """
-        payload = event.payload
         try:
-            packet = JobPacket(**payload)
+            packet = event.job_packet()
         except Exception as e:
             return
 
@@ -23,8 +23,8 @@ class KappaAgent(BaseAgent):
         
         # Initialize Cortex AI (Local Ollama)
         try:
-            from backend.ai.cortex import CortexEngine
-            self.truth_kernel = CortexEngine()
+            from backend.ai.cortex import CortexHandle
+            self.truth_kernel = CortexHandle(self.name)
         except:
             self.truth_kernel = None
             
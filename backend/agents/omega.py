@@ -2,7 +2,7 @@ import asyncio
 import random
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, TaskPriority, ModuleConfig, TaskTarget
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class OmegaAgent(BaseAgent):
     """
@@ -15,7 +15,7 @@ class OmegaAgent(BaseAgent):
         super().__init__("agent_omega", bus)
         # CORTEX AI Strategist (Local Ollama)
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
 
@@ -112,11 +112,12 @@ class OmegaAgent(BaseAgent):
             # once Beta executes and captures HTTP responses.
             
     async def dispatch_job(self, packet: JobPacket):
+        # V7: Campaign fan-out parks while the bus is over capacity
         await self.bus.publish(HiveEvent(
             type=EventType.JOB_ASSIGNED,
             source=self.name,
             payload=packet.model_dump()
-        ))
+        ), throttle=True)
 
     def _generate_mixed_strategy(self):
         strategies = ["BLITZKRIEG", "LOW_AND_SLOW", "DECEPTION"]
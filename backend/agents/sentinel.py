@@ -7,7 +7,7 @@ import asyncio
 from typing import Dict, List, Any
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, Vulnerability, TaskPriority
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class AgentTheta(BaseAgent):
     """
@@ -22,7 +22,7 @@ class AgentTheta(BaseAgent):
         
         # CORTEX AI Engine (Local Ollama)
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
         
@@ -40,15 +40,14 @@ class AgentTheta(BaseAgent):
 
     async def setup(self):
         # Subscribe to new jobs (specifically from Defense API)
-        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job)
+        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_job, route_key=AgentID.THETA)
 
     async def handle_job(self, event: HiveEvent):
         """
         Process incoming DOM Snapshot for analysis.
         """
-        payload = event.payload
         try:
-            packet = JobPacket(**payload)
+            packet = event.job_packet()
         except Exception as e:
             # print(f"[{self.name}] Error parsing job: {e}")
             return
@@ -122,7 +121,12 @@ class AgentTheta(BaseAgent):
         # 3. CORTEX AI: Semantic Injection Detection (catches novel attacks)
         if self.ai and self.ai.enabled and len(text) > 10:
             try:
-                ai_verdict = await self.ai.detect_prompt_injection(text)
+                ai_verdict = await self.ai.detect_prompt_injection(
+                    text,
+                    on_correction=self.correction_handler(
+                        "detect_prompt_injection", {"element_api_id": dom.get("antigravity_id"), "text": text[:200]}
+                    ),
+                )
                 if ai_verdict.get("is_injection"):
                     ai_risk = ai_verdict.get("risk_score", 50)
                     technique = ai_verdict.get("technique", "Unknown")
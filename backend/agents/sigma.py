@@ -4,7 +4,9 @@ import random
 import urllib.parse
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket, ResultPacket, AgentID, TaskTarget, ModuleConfig
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
+from backend.core.scheduler import current_budget
+from backend.core.config import settings
 import json
 import aiohttp
 
@@ -33,7 +35,7 @@ class SigmaAgent(BaseAgent):
         
         # CORTEX AI Generator
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
              self.ai = None
 
@@ -60,7 +62,7 @@ class SigmaAgent(BaseAgent):
 
     async def setup(self):
         # Listen for requests to generate payloads (e.g. from Beta)
-        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_generation_request)
+        self.bus.subscribe(EventType.JOB_ASSIGNED, self.handle_generation_request, route_key=AgentID.SIGMA)
 
     async def _fetch(self, target: TaskTarget) -> tuple[TaskTarget, str]:
         try:
@@ -89,9 +91,8 @@ class SigmaAgent(BaseAgent):
             return target, ""
 
     async def handle_generation_request(self, event: HiveEvent):
-        packet_dict = event.payload
         try:
-             packet = JobPacket(**packet_dict)
+             packet = event.job_packet()
         except: return
 
         if packet.config.agent_id != AgentID.SIGMA:
@@ -122,6 +123,8 @@ class SigmaAgent(BaseAgent):
             ))
                 
             # 2. EXECUTE: Concurrently fetch
+            # V7: Hold the burst (and the events it produces) while the bus is over capacity
+            await self.bus.wait_for_capacity(event.scan_id, settings.EVENTBUS_BACKPRESSURE_TIMEOUT)
             # Cyber-Organism Protocol: Native gathered orchestration
             print(f"[{self.name}] [EXECUTE] Dispatching {len(targets)} asynchronous network tasks...")
             
@@ -137,7 +140,12 @@ class SigmaAgent(BaseAgent):
                         "payload": str(t.payload)[:100] + ("..." if len(str(t.payload)) > 100 else "")
                     }
                 ))
-                return await self._fetch(t)
+                budget = current_budget.get()
+                if budget is None:
+                    return await self._fetch(t)
+                # V7: Bounded by this scan's fair share of the network budget
+                async with budget.net:
+                    return await self._fetch(t)
 
             results = await asyncio.gather(*[broadcast_fetch(t) for t in targets])
             
@@ -7,7 +7,7 @@ from collections import deque
 from backend.core.hive import BaseAgent, EventType, HiveEvent
 from backend.core.protocol import JobPacket
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 class ZetaAgent(BaseAgent):
     """
@@ -32,7 +32,7 @@ class ZetaAgent(BaseAgent):
         
         self.priority_queue = {0: [], 1: [], 2: []}
         # Hybrid AI Engine for stress analysis
-        self.cortex = CortexEngine()
+        self.cortex = CortexHandle(self.name)
 
     async def setup(self):
         self.bus.subscribe(EventType.JOB_COMPLETED, self.handle_job_completion)
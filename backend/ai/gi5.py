@@ -24,13 +24,255 @@ import base64
 import urllib.parse
 import codecs
 import binascii
+import bisect
+import hashlib
 import logging
-from typing import Dict, Any, List, Set, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick (requirements.txt); without it MultiPatternMatcher scans word by word
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np  # requirements.txt; without it analyze_threat_batch computes features per variant
+except ImportError:
+    np = None
 
 logger = logging.getLogger("GI-5")
 logging.basicConfig(level=logging.INFO)
 
 
+class MultiPatternMatcher:
+    """
+    Compiled once from a word list; `find(text)` returns every word occurring in
+    `text` as a substring (overlapping and nested occurrences included).
+
+    With pyahocorasick installed this is a single Aho-Corasick pass. Without it,
+    one C-level substring search per word is still faster in CPython than a
+    combined regex (which has to be restarted after every overlapping hit).
+    """
+    def __init__(self, words: Iterable[str]):
+        self.words = tuple(sorted(set(words)))
+        self._automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for word in self.words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> Set[str]:
+        if self._automaton is not None:
+            return {word for _, word in self._automaton.iter(text)}
+        return {word for word in self.words if word in text}
+
+
+class ContentCache:
+    """
+    Size-bounded LRU keyed by a BLAKE2 digest of the input text, so multi-MB
+    response bodies are not retained as keys. Thread-safe: the defense batch
+    endpoint runs GI5 in a worker thread next to the event loop's own calls.
+    """
+    def __init__(self, capacity: int, max_text: int):
+        self.capacity = capacity
+        self.max_text = max_text  # Longer texts bypass the cache
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class PIIScanner:
+    """
+    Prefiltered, anchor-driven scanner for GI5.PII_PATTERNS, usable one-shot
+    (`scan`) or on a stream of chunks (`feed` ... `close`).
+    
+    Each label first needs a cheap, necessary anchor: '@' for EMAIL, "eyJ" for
+    JWT, "AKIA" for AWS_KEY, "-DD-" for SSN, a 13-digit run for CREDIT_CARD, a
+    keyword for API_KEY. Labels whose anchor is absent are skipped, and
+    the full pattern runs only at anchor positions. A label stops being
+    searched once found.
+    
+    Streaming keeps the last `overlap` characters (plus one character of left
+    context) between chunks. If a pattern ends in a word boundary, its match is
+    accepted only once the character after it has been seen, so chunk edges never
+    create false boundaries. Such a match longer than `overlap` that straddles a
+    chunk edge can be missed (none of the bounded PII formats gets close).
+    """
+    _SSN_ANCHOR = re.compile(r'-\d{2}-')
+    _CARD_ANCHOR = re.compile(r'\d{13}')
+    _EMAIL_LOCAL = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+    _EMAIL_DOMAIN_END = re.compile(r'[^A-Za-z0-9.|-]')
+    _API_KEY_WORDS = ("sk", "pk", "key", "secret", "token")
+    _API_KEY_ANCHOR = re.compile(r'sk|pk|key|secret|token', re.IGNORECASE)
+    _LITERAL_ANCHORS = {"JWT": "eyJ", "AWS_KEY": "AKIA", "DOCKER_CONFIG": "docker-config-hash:"}
+
+    def __init__(self, patterns: Dict[str, Any], overlap: int = 4096):
+        self.patterns = patterns
+        self.overlap = overlap
+        self.found: Set[str] = set()
+        # Labels whose match depends on the character after it (trailing \b)
+        self._lookahead = {label for label, pattern in patterns.items() if pattern.pattern.endswith(r'\b')}
+        self._tail = ""
+        self._tail_start = 0  # First tail index not yet scanned as a match start (index 0 may be left context)
+
+    @property
+    def done(self) -> bool:
+        return len(self.found) == len(self.patterns)
+
+    def labels(self) -> List[str]:
+        """Found labels in PII_PATTERNS order."""
+        return [label for label in self.patterns if label in self.found]
+
+    # --- Stream / one-shot ---
+
+    def scan(self, text: str) -> Set[str]:
+        """Scans one complete string (no chunk edges)."""
+        self._scan(text, 0, final=True)
+        return self.found
+
+    def feed(self, chunk: str) -> Set[str]:
+        if self.done:
+            return self.found
+        buffer = self._tail + chunk
+        start = self._tail_start
+        self._scan(buffer, start, final=False)
+        cut = max(len(buffer) - self.overlap, start)
+        context = max(cut - 1, 0)
+        self._tail = buffer[context:]
+        self._tail_start = cut - context
+        return self.found
+
+    def close(self) -> Set[str]:
+        """Accepts matches ending exactly at the end of the stream; `found` is kept for the next stream."""
+        if self._tail and not self.done:
+            self._scan(self._tail, self._tail_start, final=True)
+        self._tail = ""
+        self._tail_start = 0
+        return self.found
+
+    # --- Matching ---
+
+    def _scan(self, buffer: str, start: int, final: bool):
+        for label, pattern in self.patterns.items():
+            if label in self.found:
+                continue
+            deferrable = not final and label in self._lookahead
+            for match in self.matches(label, pattern, buffer, start):
+                if not deferrable or match.end() < len(buffer):
+                    self.found.add(label)
+                    break
+
+    def matches(self, label: str, pattern, buffer: str, start: int = 0):
+        """Yields matches of `pattern` in buffer[start:] (left context from buffer[start - 1])."""
+        literal = self._LITERAL_ANCHORS.get(label)
+        if literal is not None:
+            if buffer.find(literal, start) < 0:
+                return
+            yield from self._restarting(pattern, buffer, start)
+        elif label == "SSN":
+            yield from self._anchored(pattern, self._SSN_ANCHOR, buffer, start, back=3)
+        elif label == "CREDIT_CARD":
+            # Matches start a digit run, so a 13-digit hit never hides another start
+            yield from self._anchored(pattern, self._CARD_ANCHOR, buffer, start, back=0, skip=True)
+        elif label == "EMAIL":
+            yield from self._emails(pattern, buffer, start)
+        elif label == "API_KEY":
+            yield from self._keyword_anchored(pattern, buffer, start)
+        else:
+            yield from self._restarting(pattern, buffer, start)
+
+    @staticmethod
+    def _restarting(pattern, buffer: str, start: int):
+        # Restart right after each match start so overlapping candidates are not skipped
+        pos = start
+        while True:
+            match = pattern.search(buffer, pos)
+            if match is None:
+                return
+            yield match
+            pos = match.start() + 1
+
+    @staticmethod
+    def _anchored(pattern, anchor, buffer: str, start: int, back: int, skip: bool = False):
+        # Every match contains `anchor` at a fixed offset `back` from its start
+        pos = start
+        while True:
+            hit = anchor.search(buffer, pos)
+            if hit is None:
+                return
+            if hit.start() - back >= start:
+                match = pattern.match(buffer, hit.start() - back)
+                if match is not None:
+                    yield match
+            pos = hit.end() if skip else hit.start() + 1
+
+    def _emails(self, pattern, buffer: str, start: int):
+        # Every match holds exactly one '@': search only the local-part run before it
+        # and the domain run after it (endpos one past the run, so '\b' sees a real char)
+        at = buffer.find("@", start)
+        while at >= 0:
+            left = at
+            while left > start and buffer[left - 1] in self._EMAIL_LOCAL:
+                left -= 1
+            end = self._EMAIL_DOMAIN_END.search(buffer, at + 1)
+            match = pattern.search(buffer, left, end.start() + 1 if end else len(buffer))
+            if match is not None:
+                yield match
+            at = buffer.find("@", at + 1)
+
+    def _keyword_anchored(self, pattern, buffer: str, start: int):
+        lowered = buffer.lower()
+        if not buffer.isascii():
+            # IGNORECASE also folds 'ſ' to 's' (lower() handles the Kelvin sign); a
+            # length change (e.g. 'İ') shifts offsets, so fall back to the anchor regex
+            lowered = lowered.replace("\u017f", "s")
+            if len(lowered) != len(buffer):
+                yield from self._anchored(pattern, self._API_KEY_ANCHOR, buffer, start, back=0)
+                return
+        for word in self._API_KEY_WORDS:
+            at = lowered.find(word, start)
+            while at >= 0:
+                match = pattern.match(buffer, at)
+                if match is not None:
+                    yield match
+                at = lowered.find(word, at + 1)
+
+
 class GeneralIntelligence5:
     """
     GI5 "OMEGA" EDITION: The Deterministic Cyber-Forensic God Class.
@@ -82,6 +324,9 @@ class GeneralIntelligence5:
         "dropbox", "zoom", "slack", "salesforce", "adobe", "oracle"
     ]
     
+    # Max edit distance at which a domain root counts as impersonating a trusted root
+    TYPOSQUAT_DISTANCE = 2
+    
     # Leet-speak reversal map (for skeleton normalization)
     LEET_MAP = {
         '1': 'i', '!': 'i', 'l': 'i', '|': 'i',
@@ -97,6 +342,12 @@ class GeneralIntelligence5:
         'ḷ': 'l', 'ṃ': 'm', 'ṇ': 'n', 'ṭ': 't', 'ṿ': 'v', 'ẉ': 'w'
     }
     
+    _NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+    # Characters counted by the syntax density check
+    SYNTAX_CHARS = ';{}()<>$[]='
+    _SYNTAX_RE = re.compile(r'[;{}\(\)<>\$\[\]=]')
+
     # Zero-width and invisible characters
     INVISIBLE_CHARS = re.compile(r'[\u200b\u200c\u200d\u200e\u200f\ufeff\u00ad\u034f\u2060\u2061\u2062\u2063\u2064\u0000-\u001f]')
 
@@ -110,6 +361,10 @@ class GeneralIntelligence5:
         "DOCKER_CONFIG": re.compile(r'docker-config-hash:[a-fA-F0-9]{40,64}'),
         "AWS_KEY": re.compile(r'AKIA[0-9A-Z]{16}'),
     }
+    
+    # Variants longer than this are fed to the PII scanner in overlapping chunks
+    PII_STREAM_THRESHOLD = 1_000_000
+    PII_CHUNK_SIZE = 262_144
 
     def __init__(self):
         """Initialize the OMEGA Engine."""
@@ -117,6 +372,14 @@ class GeneralIntelligence5:
         self.sigmoid_steepness = 0.1
         self.max_recursion_depth = 3
         self.enabled = True
+        # Multi-pattern matchers: one pass per variant for all vector words / skeletons
+        self._vector_matcher = MultiPatternMatcher(w for vector_set, _ in self.TOXIC_VECTORS for w in vector_set)
+        self._skeleton_matcher = MultiPatternMatcher(self.INJECTION_SKELETONS)
+        # Memoized pipeline: text -> decoded variants / PII labels, variant -> per-variant features
+        self._decode_cache = ContentCache(capacity=1024, max_text=1_000_000)
+        self._feature_cache = ContentCache(capacity=8192, max_text=1_000_000)
+        self._sensitivity_cache = ContentCache(capacity=1024, max_text=1_000_000)
+        self.load_trusted_roots(self.TRUSTED_ROOTS)
         logger.info("GI-5: OMEGA KERNEL ONLINE. 6-Core Forensic Stack Active.")
 
     # ═══════════════════════════════════════════════════════════════════════════
@@ -247,21 +510,20 @@ class GeneralIntelligence5:
         
         result = text.lower()
         
-        # Leet-speak reversal
+        # Leet-speak reversal (str.replace: translate() loses its fast path on non-ASCII text)
         for leet, replacement in self.LEET_MAP.items():
             result = result.replace(leet, replacement)
         
         # Strip non-alphanumeric
-        result = re.sub(r'[^a-z0-9]', '', result)
-        
-        return result
+        return self._NON_ALNUM.sub('', result)
 
     def _scan_injection_patterns(self, text: str) -> Tuple[bool, str]:
         """Scans normalized text for injection pattern skeletons."""
-        skeleton = self._normalize_skeleton(text)
+        found = self._skeleton_matcher.find(self._normalize_skeleton(text))
         
+        # First match in INJECTION_SKELETONS order
         for pattern in self.INJECTION_SKELETONS:
-            if pattern in skeleton:
+            if pattern in found:
                 return (True, pattern)
         
         return (False, "")
@@ -316,13 +578,13 @@ class GeneralIntelligence5:
         
         Returns (risk_weight, threat_description)
         """
-        normalized = text.lower()
+        found = self._vector_matcher.find(text.lower())
         max_risk = 0
         detected_threat = ""
         
         for vector_set, threat_name in self.TOXIC_VECTORS:
             # Count how many words from the toxic vector are present
-            hits = sum(1 for word in vector_set if word in normalized)
+            hits = len(vector_set & found)
             
             # If 2+ words from the vector are present, it's a match
             if hits >= 2:
@@ -367,8 +629,73 @@ class GeneralIntelligence5:
         
         return previous_row[-1]
 
+    def _levenshtein_within(self, s1: str, s2: str, max_distance: int) -> int:
+        """
+        Thresholded Levenshtein: the distance if it is <= max_distance, else max_distance + 1.
+        
+        Length-difference prefilter, then a DP restricted to the diagonal band
+        |i - j| <= max_distance with early exit once a whole row exceeds the bound:
+        O(len * max_distance) instead of O(len1 * len2).
+        """
+        cap = max_distance + 1
+        if abs(len(s1) - len(s2)) > max_distance:
+            return cap
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        if not s2:
+            return len(s1)
+        
+        previous_row = [j if j <= max_distance else cap for j in range(len(s2) + 1)]
+        for i, c1 in enumerate(s1, 1):
+            current_row = [cap] * (len(s2) + 1)
+            current_row[0] = i if i <= max_distance else cap
+            row_min = current_row[0]
+            for j in range(max(1, i - max_distance), min(len(s2), i + max_distance) + 1):
+                cost = min(previous_row[j] + 1, current_row[j - 1] + 1, previous_row[j - 1] + (c1 != s2[j - 1]))
+                current_row[j] = cost if cost < cap else cap
+                if cost < row_min:
+                    row_min = cost
+            if row_min > max_distance:
+                return cap
+            previous_row = current_row
+        return previous_row[-1]
+
+    @staticmethod
+    def _deletion_neighborhood(word: str, depth: int) -> Set[str]:
+        """`word` and every string reachable from it by up to `depth` character deletions."""
+        neighborhood = {word}
+        frontier = {word}
+        for _ in range(depth):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            neighborhood |= frontier
+        return neighborhood
+
+    def load_trusted_roots(self, roots: Iterable[str]):
+        """
+        (Re)builds the typosquatting index for a trusted-brand list (thousands of roots):
+        - SymSpell-style map from every <=TYPOSQUAT_DISTANCE-deletion variant of a root to
+          the roots producing it. Two strings within edit distance k always share such a
+          variant, so a lookup only verifies the few roots found under the query's own variants.
+        - MultiPatternMatcher over the roots for the "trusted root embedded in domain" check.
+        """
+        self.TRUSTED_ROOTS = list(roots)
+        self._trusted_rank: Dict[str, int] = {}
+        index: Dict[str, Set[int]] = {}
+        for rank, root in enumerate(self.TRUSTED_ROOTS):
+            self._trusted_rank.setdefault(root, rank)
+            for variant in self._deletion_neighborhood(root, self.TYPOSQUAT_DISTANCE):
+                index.setdefault(variant, set()).add(rank)
+        self._trusted_index = index
+        self._trusted_matcher = MultiPatternMatcher(self.TRUSTED_ROOTS)
+        self._trusted_max_len = max(map(len, self.TRUSTED_ROOTS), default=0)
+
     def _detect_typosquatting(self, domain: str) -> Tuple[bool, str, int]:
-        """Detects if a domain is attempting to impersonate a trusted root."""
+        """
+        Detects if a domain is attempting to impersonate a trusted root.
+        
+        A root within edit distance 1-2 of a trusted root, or containing one, is flagged;
+        when several qualify, the earliest in TRUSTED_ROOTS wins (distance check first).
+        """
         if not domain:
             return (False, "", 0)
         
@@ -377,19 +704,29 @@ class GeneralIntelligence5:
         root = normalized.split('.')[0] if '.' in domain else normalized
         root = re.sub(r'(com|org|net|io|co|uk|de|fr|app|dev)$', '', root)
         
-        for trusted in self.TRUSTED_ROOTS:
-            if root == trusted:
-                continue
-            
-            distance = self._levenshtein_distance(root, trusted)
-            
-            if 0 < distance <= 2:
-                return (True, trusted, distance)
-            
-            if trusted in root and root != trusted:
-                return (True, trusted, 1)
+        k = self.TYPOSQUAT_DISTANCE
+        matches: Dict[int, int] = {}  # trusted rank -> reported distance
+        
+        # 1. Near-miss spellings via the deletion index (length prefilter: |len diff| <= k)
+        if len(root) <= self._trusted_max_len + k:
+            candidates: Set[int] = set()
+            for variant in self._deletion_neighborhood(root, k):
+                candidates |= self._trusted_index.get(variant, set())
+            for rank in candidates:
+                distance = self._levenshtein_within(root, self.TRUSTED_ROOTS[rank], k)
+                if 0 < distance <= k:
+                    matches[rank] = distance
         
-        return (False, "", 0)
+        # 2. Trusted root embedded in a longer name ("paypal-secure-login")
+        for trusted in self._trusted_matcher.find(root):
+            rank = self._trusted_rank[trusted]
+            if trusted != root and rank not in matches:
+                matches[rank] = 1
+        
+        if not matches:
+            return (False, "", 0)
+        rank = min(matches)
+        return (True, self.TRUSTED_ROOTS[rank], matches[rank])
 
     # ═══════════════════════════════════════════════════════════════════════════
     # SIGMOID AGGREGATOR: Non-Linear Risk Fusion
@@ -426,18 +763,60 @@ class GeneralIntelligence5:
         if not text:
             return []
         
-        detected = []
-        # Scan variants for deobfuscated PII
-        clean = self._sanitize_input(text)
-        variants = self._heuristic_crack(clean)
+        cacheable = isinstance(text, str) and len(text) <= self._sensitivity_cache.max_text
+        if cacheable:
+            key = ContentCache.key(text)
+            cached = self._sensitivity_cache.get(key)
+            if cached is not None:
+                return list(cached)
         
-        all_text = " ".join(variants)
-        for label, pattern in self.PII_PATTERNS.items():
-            if pattern.search(all_text):
-                detected.append(label)
+        # Scan variants for deobfuscated PII. No pattern matches whitespace, so scanning
+        # each variant on its own finds exactly what one joined buffer would.
+        scanner = PIIScanner(self.PII_PATTERNS)
+        for variant in self._decode_variants(text):
+            if len(variant) > self.PII_STREAM_THRESHOLD:
+                for offset in range(0, len(variant), self.PII_CHUNK_SIZE):
+                    scanner.feed(variant[offset:offset + self.PII_CHUNK_SIZE])
+                    if scanner.done:
+                        break
+                scanner.close()
+            else:
+                scanner.scan(variant)
+            if scanner.done:
+                break
+        detected = scanner.labels()
         
+        if cacheable:
+            self._sensitivity_cache.put(key, tuple(detected))
         return detected
 
+    def analyze_sensitivity_batch(self, texts: List[str],
+                                  candidate_sets: Optional[List[Set[str]]] = None) -> List[List[str]]:
+        """
+        analyze_sensitivity for many texts: each PII pattern makes one anchor-driven pass
+        (PIIScanner.matches) over a single buffer of all texts' variants. No pattern can
+        match across whitespace, so a match never spans two texts and is attributed by offset.
+        `candidate_sets` are the texts' already decoded variants (see analyze_batch).
+        """
+        if candidate_sets is None:
+            candidate_sets = [self._decode_variants(text) if text else () for text in texts]
+        pieces: List[str] = []
+        starts: List[int] = []
+        offset = 0
+        for candidates in candidate_sets:
+            piece = " ".join(candidates)
+            starts.append(offset)
+            pieces.append(piece)
+            offset += len(piece) + 1
+        buffer = "\n".join(pieces)
+        
+        found: List[Set[str]] = [set() for _ in texts]
+        scanner = PIIScanner(self.PII_PATTERNS)
+        for label, pattern in self.PII_PATTERNS.items():
+            for match in scanner.matches(label, pattern, buffer):
+                found[bisect.bisect_right(starts, match.start()) - 1].add(label)
+        return [[label for label in self.PII_PATTERNS if label in labels] for labels in found]
+
     # ═══════════════════════════════════════════════════════════════════════════
     # MASTER PROCESSOR: UNIFIED THREAT ASSESSMENT
     # ═══════════════════════════════════════════════════════════════════════════
@@ -456,7 +835,122 @@ class GeneralIntelligence5:
         
         Returns verdict with full forensic reasoning chain.
         """
-        raw_text = payload.get("text", "")
+        # ─── PHASE 1+2: SANITIZATION + POLY-CIPHER CRACKING ───
+        # Attempt to decode all obfuscation layers (memoized)
+        candidates = self._decode_variants(payload.get("text", ""))
+        
+        return self._assess(payload, candidates, self._features_for(candidates))
+
+    def analyze_threat_batch(self, payloads: List[Dict[str, Any]],
+                             candidate_sets: Optional[List[Set[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        analyze_threat over many payloads (e.g. every text node of a page) in one call.
+        
+        Decoded variants are pooled across payloads (identical DOM texts are analyzed
+        once) and entropy / syntax density are computed for all of them together;
+        with NumPy that is one code-point histogram over the concatenated buffer
+        (without it, the same per-variant loop as analyze_threat).
+        Results match analyze_threat per payload (entropy up to float rounding).
+        """
+        if candidate_sets is None:
+            candidate_sets = [self._decode_variants(p.get("text", "")) for p in payloads]
+        unique = list({variant for candidates in candidate_sets for variant in candidates})
+        features = self._features_for(unique, bulk=True)
+        return [self._assess(p, candidates, features) for p, candidates in zip(payloads, candidate_sets)]
+
+    def analyze_batch(self, payloads: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+        """Threat verdicts and PII labels for many payloads, decoding each text once."""
+        candidate_sets = [self._decode_variants(p.get("text", "")) for p in payloads]
+        return (self.analyze_threat_batch(payloads, candidate_sets),
+                self.analyze_sensitivity_batch([p.get("text", "") for p in payloads], candidate_sets))
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # MEMOIZATION: identical texts / variants recur across page loads and race tests
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _decode_variants(self, text: str) -> Set[str]:
+        """_heuristic_crack(_sanitize_input(text)), memoized. The returned set is shared: do not mutate."""
+        if not isinstance(text, str) or len(text) > self._decode_cache.max_text:
+            return self._heuristic_crack(self._sanitize_input(text))
+        key = ContentCache.key(text)
+        variants = self._decode_cache.get(key)
+        if variants is None:
+            variants = self._heuristic_crack(self._sanitize_input(text))
+            self._decode_cache.put(key, variants)
+        return variants
+
+    def _features_for(self, variants: Iterable[str], bulk: bool = False) -> Dict[str, Tuple]:
+        """Per-variant feature tuples (see _variant_features), memoized; misses computed together when `bulk`."""
+        features: Dict[str, Tuple] = {}
+        missing: Dict[str, bytes] = {}
+        for variant in variants:
+            if len(variant) > self._feature_cache.max_text:
+                features[variant] = self._variant_features(variant)
+                continue
+            key = ContentCache.key(variant)
+            cached = self._feature_cache.get(key)
+            if cached is None:
+                missing[variant] = key
+            else:
+                features[variant] = cached
+        if missing:
+            if bulk:
+                computed = self._bulk_features(list(missing))
+            else:
+                computed = {variant: self._variant_features(variant) for variant in missing}
+            for variant, key in missing.items():
+                self._feature_cache.put(key, computed[variant])
+            features.update(computed)
+        return features
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            "decode": self._decode_cache.stats(),
+            "features": self._feature_cache.stats(),
+            "sensitivity": self._sensitivity_cache.stats(),
+        }
+
+    def _variant_features(self, variant: str) -> Tuple:
+        """
+        Feature tuple of one decoded variant:
+        (is_injection, pattern, vector_risk, vector_name, entropy, syntax_density);
+        entropy / density are 0.0 where their length gate is not met.
+        """
+        entropy = self._calculate_entropy(variant) if len(variant) > 25 else 0.0
+        density = len(self._SYNTAX_RE.findall(variant)) / len(variant) if len(variant) > 10 else 0.0
+        return self._scan_injection_patterns(variant) + self._vector_scan(variant) + (entropy, density)
+
+    def _bulk_features(self, variants: List[str]) -> Dict[str, Tuple]:
+        """_variant_features for many variants at once (entropy / density vectorized when NumPy is available)."""
+        if np is None or not variants:
+            return {variant: self._variant_features(variant) for variant in variants}
+        
+        lengths = np.fromiter(map(len, variants), dtype=np.int64, count=len(variants))
+        # One code point per uint32 (matches Python's per-character iteration)
+        codes = np.frombuffer("".join(variants).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        segment = np.repeat(np.arange(len(variants), dtype=np.int64), lengths)
+        
+        # Shannon entropy: histogram of (variant, code point) pairs
+        pairs, counts = np.unique((segment.astype(np.uint64) << np.uint64(32)) | codes, return_counts=True)
+        owner = (pairs >> np.uint64(32)).astype(np.int64)
+        probability = counts / lengths[owner]
+        entropy = -np.bincount(owner, weights=probability * np.log2(probability), minlength=len(variants))
+        
+        # Syntax density: share of code characters per variant
+        syntax = np.isin(codes, np.array([ord(c) for c in self.SYNTAX_CHARS], dtype=np.uint32))
+        code_chars = np.bincount(segment, weights=syntax, minlength=len(variants))
+        density = code_chars / np.maximum(lengths, 1)
+        
+        entropy = np.where(lengths > 25, entropy, 0.0)
+        density = np.where(lengths > 10, density, 0.0)
+        return {
+            variant: self._scan_injection_patterns(variant) + self._vector_scan(variant) + (float(e), float(d))
+            for variant, e, d in zip(variants, entropy, density)
+        }
+
+    def _assess(self, payload: Dict[str, Any], candidates: Set[str],
+                features: Dict[str, Tuple]) -> Dict[str, Any]:
+        """Phases 2-6 of analyze_threat, given decoded variants and their feature tuples."""
         domain = payload.get("domain", "")
         is_hidden = payload.get("hidden", False)
         element = payload.get("element", {})
@@ -465,40 +959,28 @@ class GeneralIntelligence5:
         risk_signals: List[float] = []
         verdicts: List[str] = []
         
-        # ─── PHASE 1: SANITIZATION ───
-        clean_text = self._sanitize_input(raw_text)
-        
-        # ─── PHASE 2: POLY-CIPHER CRACKING ───
-        # Attempt to decode all obfuscation layers
-        candidates = self._heuristic_crack(clean_text)
-        
         for variant in candidates:
+            is_injection, pattern, vector_risk, vector_name, entropy, syntax_density = features[variant]
+            
             # ─── CHECK A: SKELETON PATTERN MATCHING ───
-            is_injection, pattern = self._scan_injection_patterns(variant)
             if is_injection:
                 risk_signals.append(100)
                 verdicts.append(f"Injection Pattern: '{pattern}'")
             
             # ─── CHECK B: VECTOR FINGERPRINTING ───
-            vector_risk, vector_name = self._vector_scan(variant)
             if vector_risk > 0:
                 risk_signals.append(vector_risk)
                 verdicts.append(f"Vector Match: {vector_name}")
             
-            # ─── CHECK C: ENTROPY ANALYSIS ───
-            if len(variant) > 25:
-                entropy = self._calculate_entropy(variant)
-                if entropy > self.entropy_threshold:
-                    risk_signals.append(40)
-                    verdicts.append(f"High Entropy: {entropy:.2f} bits/sym")
+            # ─── CHECK C: ENTROPY ANALYSIS ─── (variants > 25 chars)
+            if entropy > self.entropy_threshold:
+                risk_signals.append(40)
+                verdicts.append(f"High Entropy: {entropy:.2f} bits/sym")
             
-            # ─── CHECK D: SYNTAX DENSITY ───
-            if len(variant) > 10:
-                code_chars = len(re.findall(r'[;{}\(\)<>\$\[\]=]', variant))
-                syntax_density = code_chars / len(variant)
-                if syntax_density > 0.25:
-                    risk_signals.append(50)
-                    verdicts.append(f"Syntax Density: {syntax_density:.0%}")
+            # ─── CHECK D: SYNTAX DENSITY ─── (variants > 10 chars)
+            if syntax_density > 0.25:
+                risk_signals.append(50)
+                verdicts.append(f"Syntax Density: {syntax_density:.0%}")
         
         # ─── PHASE 3: TYPOSQUATTING DETECTION ───
         if domain:
@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# A request is "congested" when its time-to-first-token exceeds the recent best
+# by this factor, or its decode rate falls below this fraction of the recent best.
+TTFT_TOLERANCE = 2.0
+TPS_TOLERANCE = 0.5
+BACKOFF = 0.7  # Multiplicative decrease on congestion / failure
+WINDOW = 50  # Samples kept for the best-case TTFT / decode-rate baselines
+EWMA_ALPHA = 0.2
+
+
+class DeadlineExceeded(Exception):
+    """No slot became free before the caller's deadline."""
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for Ollama calls, used as an async context manager
+    in place of a fixed asyncio.Semaphore.
+
+    Each finished call reports its time-to-first-token (queueing + prompt eval)
+    and decode rate (tokens/sec). While both stay near the best recently seen,
+    the limit grows by ~1 per `limit` completions; a congested sample, timeout
+    or error cuts it by BACKOFF (at most once per `limit` completions, so one
+    burst of slow responses does not collapse it to the floor).
+
+    Waiters are served by rank (0 first), FIFO within a rank; a waiter whose
+    deadline passes before it gets a slot leaves with DeadlineExceeded.
+    """
+    def __init__(self, initial: int = 3, minimum: int = 1, maximum: int = 8):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self._inflight = 0
+        self._waiters: list = []  # heap of [rank, seq, future]
+        self._seq = itertools.count()
+        self._ttfts: deque = deque(maxlen=WINDOW)
+        self._rates: deque = deque(maxlen=WINDOW)
+        self._since_decrease = 0
+        self.ttft_ewma = 0.0
+        self.tps_ewma = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, rank: int = 1, deadline: Optional[float] = None) -> float:
+        """Waits for a slot; returns the seconds spent queued. `deadline` is a time.monotonic() value."""
+        if self._inflight < self.current and not self.waiting:
+            self._inflight += 1
+            return 0.0
+
+        queued_at = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [rank, next(self._seq), fut])
+        try:
+            if deadline is None:
+                await fut
+            else:
+                await asyncio.wait_for(fut, max(0.0, deadline - queued_at))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded() from None
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # Granted in the same tick we were cancelled: pass it on
+            raise
+        return time.monotonic() - queued_at
+
+    def release(self):
+        self._inflight -= 1
+        self._grant()
+
+    def _grant(self):
+        while self._waiters and self._inflight < self.current:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue  # Timed out or cancelled while queued
+            self._inflight += 1
+            fut.set_result(None)
+
+    def slot(self, rank: int = 1, deadline: Optional[float] = None) -> "_Slot":
+        return _Slot(self, rank, deadline)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    # --- Feedback ---
+
+    def record(self, ttft: Optional[float] = None, tokens_per_sec: Optional[float] = None, failed: bool = False):
+        """Feeds one finished call into the controller."""
+        self._since_decrease += 1
+        if failed:
+            self._decrease()
+            return
+
+        congested = False
+        if ttft is not None:
+            self.ttft_ewma = ttft if not self._ttfts else (1 - EWMA_ALPHA) * self.ttft_ewma + EWMA_ALPHA * ttft
+            if self._ttfts and ttft > min(self._ttfts) * TTFT_TOLERANCE:
+                congested = True
+            self._ttfts.append(ttft)
+        if tokens_per_sec:
+            self.tps_ewma = tokens_per_sec if not self._rates else (1 - EWMA_ALPHA) * self.tps_ewma + EWMA_ALPHA * tokens_per_sec
+            if self._rates and tokens_per_sec < max(self._rates) * TPS_TOLERANCE:
+                congested = True
+            self._rates.append(tokens_per_sec)
+
+        if congested:
+            self._decrease()
+        elif self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.increases += 1
+            self._grant()
+
+    def _decrease(self):
+        if self._since_decrease < self.current:
+            return
+        self._since_decrease = 0
+        self.limit = max(float(self.minimum), self.limit * BACKOFF)
+        self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current,
+            "limit_raw": round(self.limit, 2),
+            "inflight": self._inflight,
+            "waiting": self.waiting,
+            "min": self.minimum,
+            "max": self.maximum,
+            "ttft_ewma_s": round(self.ttft_ewma, 3),
+            "ttft_best_s": round(min(self._ttfts), 3) if self._ttfts else 0.0,
+            "tokens_per_sec_ewma": round(self.tps_ewma, 1),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class _Slot:
+    """`async with limiter.slot(rank, deadline):` — one prioritized, deadline-bound slot."""
+    def __init__(self, limiter: AdaptiveLimiter, rank: int, deadline: Optional[float]):
+        self.limiter = limiter
+        self.rank = rank
+        self.deadline = deadline
+        self.waited = 0.0
+
+    async def __aenter__(self):
+        self.waited = await self.limiter.acquire(self.rank, self.deadline)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.limiter.release()
@@ -0,0 +1,286 @@
+import atexit
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("CORTEX")
+
+# Seconds a response stays valid, per TOKEN_BUDGETS category (None = never expires).
+# Deterministic lookups (category, compliance mapping, remediation code) do not change
+# between scans; generative categories keep a short TTL so payloads stay varied.
+CATEGORY_TTLS: Dict[str, Optional[float]] = {
+    "classify": 3600,
+    "payload": 300,
+    "sqli": 300,
+    "fuzz": 300,
+    "forensic": 3600,
+    "cvss": 86400,
+    "audit": 300,
+    "executive": 3600,
+    "categorize": None,
+    "compliance": None,
+    "remediation": None,
+    "default": 300,
+}
+
+
+class LLMResponseCache:
+    """
+    Two-level Cortex response cache.
+
+    - Memory: OrderedDict in LRU order (O(1) hit, touch and eviction), holding
+      the `capacity` most recently used entries.
+    - Disk: SQLite store, bounded to `disk_limit` rows by evicting the least
+      recently used (indexed), warm-loaded into memory on startup.
+
+    Only memory misses read the disk on the caller's thread. Puts, deletes and
+    last-used touches are buffered and written by a background thread in one
+    transaction every `flush_interval` seconds (and on close), so the event loop
+    never waits on a write. The row count is re-read before each trim, since
+    several processes (HIVE_SHARDS workers) may share the file.
+
+    Keys combine the model, output budget and a hash of the prompt; each entry
+    carries the TTL of the TOKEN_BUDGETS category that produced it.
+    """
+    def __init__(self, path: Optional[str], capacity: int = 2000, disk_limit: int = 20000,
+                 flush_interval: float = 1.0):
+        self.capacity = capacity
+        self.disk_limit = disk_limit
+        self.flush_interval = flush_interval
+        self._mem: "OrderedDict[str, Tuple[str, float, Optional[float]]]" = OrderedDict()  # key -> (result, stored, ttl)
+        self._db: Optional[sqlite3.Connection] = None  # Reads only
+        self._path = path
+        self._rows = 0  # Disk rows as of the last flush
+        self._lock = threading.Lock()
+        self._puts: Dict[str, Tuple[str, float, Optional[float]]] = {}
+        self._deletes: set = set()
+        self._touches: Dict[str, float] = {}
+        self._closing = False
+        self._wake = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.flushes = 0
+        if path:
+            self._open(path)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, num_predict: int) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8", errors="ignore")).hexdigest()
+        return f"{model}|{num_predict}|{digest}"
+
+    # --- Disk ---
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _open(self, path: str):
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = self._connect(path)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, stored REAL NOT NULL, "
+                "ttl REAL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_used)")
+            self._db = db
+            self._warm_load()
+        except sqlite3.Error as e:
+            logger.warning(f"CORTEX: LLM cache at {path} unavailable ({e}); using memory only")
+            self._db = None
+            return
+        self._writer = threading.Thread(target=self._writer_loop, name="llm-cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _warm_load(self):
+        now = time.time()
+        self._db.execute("DELETE FROM responses WHERE ttl IS NOT NULL AND stored + ttl < ?", (now,))
+        rows = self._db.execute(
+            "SELECT key, result, stored, ttl FROM responses ORDER BY last_used DESC LIMIT ?", (self.capacity,)
+        ).fetchall()
+        # Oldest first, so the most recently used entries end up at the MRU end
+        for key, result, stored, ttl in reversed(rows):
+            self._mem[key] = (result, stored, ttl)
+        self._rows = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if rows:
+            logger.info(f"CORTEX: LLM cache warm-loaded {len(rows)} responses ({self._rows} on disk)")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float, Optional[float]]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            if key in self._deletes:
+                return None
+            pending = self._puts.get(key)
+            if pending is not None:
+                return pending
+            try:
+                return self._db.execute("SELECT result, stored, ttl FROM responses WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def _disk_delete(self, key: str):
+        if self._db is None:
+            return
+        with self._lock:
+            self._puts.pop(key, None)
+            self._touches.pop(key, None)
+            self._deletes.add(key)
+
+    def _disk_put(self, key: str, result: str, stored: float, ttl: Optional[float]):
+        if self._db is None:
+            return
+        with self._lock:
+            self._deletes.discard(key)
+            self._touches.pop(key, None)
+            self._puts[key] = (result, stored, ttl)
+
+    def _disk_touch(self, key: str, now: float):
+        if self._db is None:
+            return
+        with self._lock:
+            self._touches[key] = now
+
+    # --- Background writer ---
+
+    def _writer_loop(self):
+        try:
+            db = self._connect(self._path)
+        except sqlite3.Error as e:
+            logger.warning(f"CORTEX: LLM cache writer unavailable ({e}); disk store is read-only")
+            return
+        try:
+            while not self._closing:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._flush(db)
+            self._flush(db)  # Anything buffered while the last flush ran
+        finally:
+            db.close()
+
+    def _flush(self, db: sqlite3.Connection):
+        with self._lock:
+            puts, self._puts = self._puts, {}
+            deletes, self._deletes = self._deletes, set()
+            touches, self._touches = self._touches, {}
+        if not (puts or deletes or touches):
+            return
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if deletes:
+                    db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in deletes])
+                if puts:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO responses (key, result, stored, ttl, last_used) VALUES (?, ?, ?, ?, ?)",
+                        [(key, result, stored, ttl, stored) for key, (result, stored, ttl) in puts.items()],
+                    )
+                if touches:
+                    db.executemany("UPDATE responses SET last_used = ? WHERE key = ?",
+                                   [(used, key) for key, used in touches.items()])
+                # Other processes may write the same file: count, don't track
+                rows = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if rows > self.disk_limit:
+                    db.execute(
+                        "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                        (rows - self.disk_limit,),
+                    )
+                    rows = self.disk_limit
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self._rows = rows
+            self.flushes += 1
+        except sqlite3.Error as e:
+            logger.warning(f"CORTEX: LLM cache write failed ({len(puts)} puts dropped): {e}")
+
+    # --- Public API ---
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._mem.get(key)
+        from_disk = False
+        if entry is None:
+            entry = self._disk_get(key)
+            from_disk = entry is not None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        result, stored, ttl = entry
+        if ttl is not None and now - stored >= ttl:
+            self._mem.pop(key, None)
+            self._disk_delete(key)
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if from_disk:
+            self._remember(key, entry)
+        else:
+            self._mem.move_to_end(key)
+        self._disk_touch(key, now)
+        return result
+
+    def put(self, key: str, result: str, category: str = "default"):
+        ttl = CATEGORY_TTLS.get(category, CATEGORY_TTLS["default"])
+        stored = time.time()
+        self._remember(key, (result, stored, ttl))
+        self._disk_put(key, result, stored, ttl)
+
+    def _remember(self, key: str, entry: Tuple[str, float, Optional[float]]):
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.capacity:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def flush(self):
+        """Wakes the writer now instead of at the next interval."""
+        self._wake.set()
+
+    def close(self):
+        """Writes everything buffered, then closes the store (the cache keeps working in memory)."""
+        if self._writer is not None:
+            self._closing = True
+            self._wake.set()
+            self._writer.join()
+            self._writer = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "memory_entries": len(self._mem),
+            "disk_entries": self._rows,
+            "persistent": self._db is not None,
+            "pending_writes": len(self._puts) + len(self._deletes) + len(self._touches),
+            "flushes": self.flushes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
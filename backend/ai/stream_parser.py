@@ -0,0 +1,93 @@
+import re
+from typing import Iterable
+
+
+class StreamParser:
+    """
+    Incremental parser for a streamed Ollama response.
+
+    `feed()` receives each text chunk as it arrives and returns True once the
+    answer the caller needs is complete; CortexEngine then closes the stream,
+    which stops generation on the model server and frees the LLM slot. The
+    text seen so far is what the caller gets back, so existing post-parsing
+    keeps working unchanged. Instances are single-use (one per call).
+    """
+    name = "stream"
+
+    def __init__(self):
+        self.text = ""
+
+    def feed(self, chunk: str) -> bool:
+        self.text += chunk
+        return False
+
+
+class FirstNumber(StreamParser):
+    """Complete once the first number (e.g. a 0-100 score or a CVSS delta) has been fully emitted."""
+    name = "number"
+    _NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?(?=[^\d.])")
+
+    def feed(self, chunk: str) -> bool:
+        super().feed(chunk)
+        return self._NUMBER.search(self.text) is not None
+
+
+class FirstWord(StreamParser):
+    """Complete once one of `words` appears as a whole word (e.g. a yes/no verdict)."""
+    def __init__(self, words: Iterable[str]):
+        super().__init__()
+        self.words = tuple(w.lower() for w in words)
+        self.name = "word:" + ",".join(self.words)
+        self._pattern = re.compile(r"\b(" + "|".join(re.escape(w) for w in self.words) + r")\b(?=\W)", re.IGNORECASE)
+
+    def feed(self, chunk: str) -> bool:
+        super().feed(chunk)
+        return self._pattern.search(self.text) is not None
+
+
+class LinePrefixes(StreamParser):
+    """Complete once a finished line (newline-terminated) exists for every prefix, e.g. INJECTION:/RISK:/TECHNIQUE:."""
+    def __init__(self, prefixes: Iterable[str]):
+        super().__init__()
+        self.pending = {p.upper() for p in prefixes}
+        self.name = "lines:" + ",".join(sorted(self.pending))
+        self._line = ""
+
+    def feed(self, chunk: str) -> bool:
+        super().feed(chunk)
+        *complete, self._line = (self._line + chunk).split("\n")
+        for line in complete:
+            head = line.strip().upper()
+            self.pending = {p for p in self.pending if not head.startswith(p)}
+        return not self.pending
+
+
+class FirstJSONObject(StreamParser):
+    """Complete once the first top-level JSON object closes (string- and escape-aware brace matching)."""
+    name = "json"
+
+    def __init__(self):
+        super().__init__()
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        super().feed(chunk)
+        for ch in chunk:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    return True
+        return False
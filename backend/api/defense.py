@@ -1,15 +1,18 @@
+import asyncio
+from datetime import datetime
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from backend.core.config import settings
 # Import your orchestrator instance class to access static registry
 from backend.core.orchestrator import HiveOrchestrator
 from backend.core.protocol import JobPacket, TaskTarget, ModuleConfig, AgentID
 from backend.api.socket_manager import manager # UI Broadcast
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle, PRIORITY_INTERACTIVE, llm_priority
 
 router = APIRouter()
-cortex = CortexEngine()
+cortex = CortexHandle("defense", priority=PRIORITY_INTERACTIVE)
 
 class ThreatPayload(BaseModel):
     agent_id: str  # "THETA" or "IOTA"
@@ -17,6 +20,19 @@ class ThreatPayload(BaseModel):
     url: str
     session_id: Optional[str] = "anonymous-session" # V6: Session Persistence
 
+class ThreatElement(BaseModel):
+    """One DOM element of a batch, in the GI5 analyze_threat payload shape."""
+    text: str = ""
+    domain: str = ""
+    hidden: bool = False
+    element: Dict[str, Any] = {}  # {"styles": {...}}
+
+class ThreatBatchPayload(BaseModel):
+    agent_id: str = "THETA"
+    url: str
+    elements: List[ThreatElement]
+    session_id: Optional[str] = "anonymous-session"
+
 @router.post("/analyze")
 async def analyze_threat(payload: ThreatPayload):
     """
@@ -58,7 +74,9 @@ async def analyze_threat(payload: ThreatPayload):
     
     # 3. Execute the Agent Logic (Theta or Iota)
     # We call execute_task directly to get result immediately (synchronous wait for async func)
-    result = await agent.execute_task(packet)
+    # V7: The extension is blocked on this click, so the agent's LLM calls jump the scan/report queue
+    with llm_priority(PRIORITY_INTERACTIVE):
+        result = await agent.execute_task(packet)
     
     # 4. Return Verdict to Extension (BLOCK or ALLOW)
     reason = None
@@ -67,9 +85,7 @@ async def analyze_threat(payload: ThreatPayload):
     
     # HYBRID AI: Dynamic risk scoring instead of hardcoded 95/10
     if result.vulnerabilities:
-        context = f"{payload.url} {reason or ''}"
-        risk_assessment = cortex.assess_contextual_risk(context)
-        risk_score = risk_assessment.get("risk_score", 95)
+        risk_score = await cortex.assess_contextual_risk(reason or "UI_ANOMALY", payload.url)
     else:
         risk_score = 10
 
@@ -95,3 +111,54 @@ async def analyze_threat(payload: ThreatPayload):
         "reason": reason,
         "risk_score": risk_score
     }
+
+
+@router.post("/analyze_batch")
+async def analyze_threat_batch(payload: ThreatBatchPayload):
+    """
+    V7: Batch entry point for page-wide DOM sweeps. Runs the deterministic GI5 pipeline
+    (threat verdict + PII labels) over every element in one call instead of one
+    /analyze round trip per text node. No LLM, no agent queue.
+    """
+    if len(payload.elements) > settings.DEFENSE_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {settings.DEFENSE_BATCH_MAX} elements per batch")
+
+    elements = [el.model_dump() for el in payload.elements]
+    # CPU-bound and GIL-bound: one worker call that decodes every text once and keeps
+    # the event loop (and concurrent /analyze clicks) responsive
+    verdicts, pii = await asyncio.to_thread(cortex.analyze_batch, elements)
+
+    results = []
+    for verdict, labels in zip(verdicts, pii):
+        results.append({
+            # Fail closed: an element without a verdict is never reported safe
+            "verdict": verdict.get("verdict", "WARN"),
+            "reason": verdict.get("reason"),
+            "risk_score": verdict.get("risk_score", 0),
+            "pii": labels,
+        })
+
+    worst = max(results, key=lambda r: r["risk_score"], default=None)
+    blocked = sum(1 for r in results if r["verdict"] == "BLOCK")
+    if blocked:
+        # BROADCAST TO UI: one summary line per batch
+        await manager.broadcast({
+            "type": "LIVE_THREAT_LOG",
+            "source": payload.agent_id,
+            "payload": {
+                "timestamp": datetime.now().isoformat(),
+                "agent": payload.agent_id,
+                "threat_type": f"{worst['reason']} ({blocked}/{len(results)} elements)",
+                "url": payload.url,
+                "severity": "CRITICAL",
+                "risk_score": worst["risk_score"],
+                "verdict": "BLOCK"
+            }
+        })
+
+    return {
+        "verdict": "BLOCK" if blocked else ("WARN" if any(r["verdict"] == "WARN" for r in results) else "ALLOW"),
+        "risk_score": worst["risk_score"] if worst else 0,
+        "count": len(results),
+        "results": results,
+    }
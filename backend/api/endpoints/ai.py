@@ -1,12 +1,12 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
-from backend.ai.cortex import CortexEngine
-from backend.core.orchestrator import HiveOrchestrator
+from backend.ai.cortex import CortexHandle
+from backend.core.scheduler import scan_scheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
 
 # Initialize Router
 router = APIRouter()
-brain = CortexEngine()
+brain = CortexHandle("api_ai")
 
 class MutationRequest(BaseModel):
     url: str
@@ -17,6 +17,7 @@ class MutationRequest(BaseModel):
     # New Config Fields matching Frontend
     interception_filters: Optional[List[str]] = [] 
     logic_vectors: Optional[List[Dict[str, Any]]] = []
+    priority: int = Field(PRIORITY_NORMAL, ge=PRIORITY_HIGH, le=PRIORITY_LOW)  # Scheduler queue priority (0 = first)
 
 @router.post("/mutate")
 async def generate_mutations(payload: MutationRequest):
@@ -32,17 +33,18 @@ async def generate_mutations(payload: MutationRequest):
     return {"status": "success", "variants": variants}
 
 @router.post("/autonomous/engage")
-async def engage_autonomous(payload: MutationRequest, background_tasks: BackgroundTasks):
+async def engage_autonomous(payload: MutationRequest):
     """
     Full Auto Mode: Bootstraps the Hive Mind.
     """
     scan_id = "HIVE-" + payload.url.replace("https://", "").replace("http://", "")[:10]
     
     # Pass full payload to the Hive Orchestrator
-    background_tasks.add_task(HiveOrchestrator.bootstrap_hive, payload.model_dump(), scan_id)
+    admission = await scan_scheduler.submit(payload.model_dump(exclude={"priority"}), scan_id, payload.priority)
     
     return {
-        "status": "launched", 
+        "status": "launched" if admission["state"] == "running" else "queued", 
         "message": "Hive Mind Swarm Activated",
-        "scan_id": scan_id 
+        "scan_id": scan_id,
+        "queue_position": admission["position"]
     }
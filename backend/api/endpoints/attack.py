@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from backend.schemas.payloads import AttackPayload
-from backend.core.orchestrator import HiveOrchestrator
+from backend.core.scheduler import scan_scheduler
 from backend.api.socket_manager import manager
 from datetime import datetime
 import uuid
@@ -9,7 +9,7 @@ from backend.core.state import stats_db
 router = APIRouter()
 
 @router.post("/fire")
-async def fire_attack(payload: AttackPayload, background_tasks: BackgroundTasks):
+async def fire_attack(payload: AttackPayload):
     """
     Triggers the Antigravity V5 Singularity Swarm.
     Replaces legacy Gatekeeper Engine.
@@ -52,13 +52,19 @@ async def fire_attack(payload: AttackPayload, background_tasks: BackgroundTasks)
     }
     stats_db_manager.register_scan(scan_record)
     
-    # 3. Launch The Hive (Background Task)
-    # The Orchestrator manages the entire lifecycle (Agents, EventBus, Reporting)
-    background_tasks.add_task(HiveOrchestrator.bootstrap_hive, target_config, scan_id)
+    # 3. Launch The Hive (Scheduled)
+    # The Scheduler admits the scan when a slot is free; the Orchestrator manages the lifecycle
+    admission = await scan_scheduler.submit(target_config, scan_id, payload.priority)
     
     # 4. Immediate Response
     return {
-        "status": "Swarm Online",
+        "status": "Swarm Online" if admission["state"] == "running" else "Queued",
         "scan_id": scan_id,
+        "queue_position": admission["position"],
         "message": "The Singularity has been unleashed. Monitor the 'Live Graph' for real-time telemetry."
     }
+
+@router.get("/queue")
+async def scan_queue():
+    """V7: Scheduler state (running scans, pending queue, fair shares)."""
+    return scan_scheduler.get_status()
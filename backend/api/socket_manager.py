@@ -15,6 +15,9 @@ class SocketManager:
         self.message_queue = []
         self._batch_task = None
 
+        # V7 SHARD: in a worker process, UI messages are relayed to the API process instead
+        self.relay = None
+
     def _start_batch_task(self):
         if self._batch_task is None:
             self._batch_task = asyncio.create_task(self._process_batch_queue())
@@ -87,6 +90,9 @@ class SocketManager:
         await self.broadcast_to_ui(data)
 
     async def broadcast_to_ui(self, data: dict):
+        if self.relay is not None:
+            self.relay(data)
+            return
         # Queue the message instead of sending immediately
         self.message_queue.append(data)
 
@@ -2,10 +2,10 @@ import aiohttp
 import asyncio
 import json
 from typing import Dict, Any, List
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 # Initialize Brain (Local Ollama)
-brain = CortexEngine()
+brain = CortexHandle("chaos")
 
 class ChaosEngine:
     def __init__(self, target_url: str, method: str, headers: Dict[str, str], body: Any):
@@ -4,11 +4,11 @@ import ssl
 import asyncio
 import numpy as np
 from urllib.parse import urlparse
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 from typing import List, Dict, Any
 
 # Initialize Brain (Local Ollama)
-brain = CortexEngine()
+brain = CortexHandle("chronomancer")
 
 class ChronomancerEngine:
     def __init__(self, target_url, method, headers, body, concurrency=50):
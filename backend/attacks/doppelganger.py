@@ -1,10 +1,10 @@
 import aiohttp
 import asyncio
 from typing import Dict, Any, List
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
 # Initialize Brain (Local Ollama)
-brain = CortexEngine()
+brain = CortexHandle("attack_doppelganger")
 
 class DoppelgangerEngine:
     def __init__(self, target_url: str, method: str, headers: Dict[str, str], body: str):
@@ -58,10 +58,10 @@ class BaseArsenalModule(ABC):
     
     @property
     def cortex(self):
-        """Lazy-load CortexEngine for hybrid AI in arsenal modules."""
+        """Lazy-load a CortexHandle (shared CortexEngine) for hybrid AI in arsenal modules."""
         if not hasattr(self, '_cortex') or self._cortex is None:
-            from backend.ai.cortex import CortexEngine
-            self._cortex = CortexEngine()
+            from backend.ai.cortex import CortexHandle
+            self._cortex = CortexHandle(type(self).__name__)
         return self._cortex
     
     async def think(self, context: Any):
@@ -1,3 +1,5 @@
+import os
+
 class Config:
     # System Constants
     DEFAULT_CONCURRENCY = 50
@@ -8,6 +10,64 @@ class Config:
     # Scan Configuration
     SCAN_TIMEOUT = 180  # Max scan duration in seconds (3 minutes)
     DEPTH_SCAN_TIMEOUT = 240  # 4 minutes for depth scans
+    SCAN_QUIESCENCE_GRACE = 5.0  # Idle seconds (no handlers, queues drained, no open jobs) before a scan ends early
+    SCAN_REFINEMENT_DRAIN = 15.0  # Max seconds a scan that hit its duration waits for background LLM refinements
+    
+    # EventBus Dispatch
+    EVENTBUS_DISPATCH_MODE = "parallel"  # "serial" (one handler at a time) or "parallel"
+    EVENTBUS_HANDLER_CONCURRENCY = 8  # Default max in-flight events per handler (parallel mode)
+    EVENTBUS_QUEUE_MAXSIZE = 1000  # Soft bound on queued critical/normal events per scan (never dropped)
+    EVENTBUS_TELEMETRY_CAPACITY = 256  # LOG / LIVE_ATTACK slots per scan; oldest shed when full
+    EVENTBUS_GLOBAL_INFLIGHT_LIMIT = 2000  # GLOBAL telemetry is shed above this many in-flight handlers
+    EVENTBUS_BACKPRESSURE_TIMEOUT = 5.0  # Max seconds publish(throttle=True) waits for queue capacity
+    EVENTBUS_DEDUP_WINDOW = 1000  # Most recent event ids remembered per scan
+    EVENTBUS_DEDUP_TTL = None  # Optional age bound in seconds for remembered ids (None = count only)
+    EVENT_JOURNAL_DIR = "journals"  # Per-scan append-only event journals (report input, replay)
+    EVENT_JOURNAL_KEEP = 50  # Most recent journals kept; older ones pruned when a scan starts (None = no cap)
+    EVENT_JOURNAL_MAX_AGE = 7 * 86400  # Seconds a journal is kept (None = no age limit)
+    
+    # Cortex LLM concurrency (adaptive AIMD limit between MIN and MAX)
+    LLM_CONCURRENCY_INITIAL = 3  # Starting in-flight Ollama calls per process
+    LLM_CONCURRENCY_MIN = 1
+    LLM_CONCURRENCY_MAX = 8  # Server-grade Ollama hosts (OLLAMA_NUM_PARALLEL > 1) can use more
+    OLLAMA_NUM_THREAD = 4  # CPU threads per generation; None lets Ollama pick for the host
+    OLLAMA_KEEP_ALIVE = "30m"  # How long Ollama keeps the model (and its prompt-prefix KV cache) loaded
+    # Per priority class (interactive / scan / report): max seconds to wait for an Ollama slot
+    # before falling back to GI5 (None = wait), and the end-to-end latency SLO reported in telemetry
+    LLM_CLASS_DEADLINES = {"interactive": 2.0, "scan": None, "report": None}
+    LLM_CLASS_SLOS = {"interactive": 3.0, "scan": 30.0, "report": 120.0}
+    
+    # Speculative GI5 fast-path: return the GI5 verdict at once when its confidence reaches
+    # `threshold`, or when the LLM misses `budget` seconds (None = always wait); the LLM keeps
+    # refining in the background and a disagreement publishes VERDICT_CORRECTED
+    CORTEX_SPECULATIVE = True
+    CORTEX_SPECULATION = {
+        "audit_candidate": {"threshold": 0.85, "budget": None},
+        "detect_prompt_injection": {"threshold": 0.9, "budget": 1.5},
+        "classify_target": {"threshold": 0.8, "budget": 2.0},
+    }
+    
+    # Self-consistency in audit_candidate: AUDIT_SAMPLES concurrent seeded samples at
+    # AUDIT_SAMPLE_TEMPERATURE; the verify prompt is skipped when every sample agrees
+    # with confidence >= AUDIT_DECISIVE_CONFIDENCE (0-100)
+    AUDIT_SAMPLES = 2
+    AUDIT_SAMPLE_TEMPERATURE = 0.6
+    AUDIT_DECISIVE_CONFIDENCE = 80
+    
+    # Cortex LLM response cache
+    LLM_CACHE_PATH = os.path.join("brain", "llm_cache.sqlite3")  # Persistent store; None keeps the cache in memory only
+    LLM_CACHE_CAPACITY = 2000  # Responses held in memory (LRU)
+    LLM_CACHE_DISK_LIMIT = 20000  # Responses kept on disk; least recently used evicted beyond this
+    
+    # Scan Scheduler (admission control)
+    SCAN_MAX_CONCURRENT = 3  # Scans running at once; further submissions queue by priority/cost
+    LLM_CONCURRENCY_BUDGET = 3  # Concurrent Ollama calls shared fairly across running scans
+    
+    # Sharding (multi-process hive)
+    HIVE_SHARDS = 0  # Worker processes for scans; 0 runs every scan on the API event loop
+    
+    # Extension defense: max DOM elements per /api/defense/analyze_batch request
+    DEFENSE_BATCH_MAX = 2000
     
     # Recon Constants
     IGNORED_EXTENSIONS = ['.jpg', '.png', '.gif', '.css', '.js', '.woff2', '.svg']
@@ -1,6 +1,192 @@
 import asyncio
+import collections
+import time
 import uuid
-from typing import Dict, Any, Set
+from typing import Dict, Any, Set, Optional
+
+from backend.core.config import settings
+
+# Lane classification by EventType value (plain strings: hive.py imports this module)
+CRITICAL_EVENTS = frozenset({"VULN_CONFIRMED", "JOB_COMPLETED", "VERDICT_CORRECTED"})
+TELEMETRY_EVENTS = frozenset({"LOG", "LIVE_ATTACK"})
+
+
+def _type_name(event) -> str:
+    return getattr(event.type, "value", event.type)
+
+
+def _coalesce_key(event) -> tuple:
+    """Telemetry superseded by a newer event with the same key only keeps the newest."""
+    payload = event.payload or {}
+    if _type_name(event) == "LIVE_ATTACK":
+        return ("LIVE_ATTACK", event.source, payload.get("url"), payload.get("action"))
+    if "message" in payload:
+        return ("LOG", event.source, payload.get("message"))
+    return ("ID", event.id)
+
+
+class LanedEventQueue:
+    """
+    Bounded, laned replacement for the per-scan asyncio.Queue.
+
+    - Critical + main lane: every non-telemetry event, dequeued in arrival order so
+      per-(handler, target) causal order holds across event types. Never dropped.
+      Critical events (VULN_CONFIRMED, JOB_COMPLETED, VERDICT_CORRECTED) differ only
+      in that producers never throttle on them. `maxsize` is a soft bound on these
+      events, queued or handed out by get() and not yet task_done(event), that raises
+      backpressure (producers park in EventBus.wait_for_capacity /
+      publish(throttle=True) until it drains).
+    - Telemetry lane: LOG / LIVE_ATTACK, coalesced by key and capped at
+      `telemetry_capacity` (oldest shed first). Only drained when the main lane is empty.
+    """
+    def __init__(self, maxsize: Optional[int] = None, telemetry_capacity: Optional[int] = None):
+        self.maxsize = maxsize or settings.EVENTBUS_QUEUE_MAXSIZE
+        self.telemetry_capacity = telemetry_capacity or settings.EVENTBUS_TELEMETRY_CAPACITY
+        self._main: collections.deque = collections.deque()
+        self._telemetry: "collections.OrderedDict[tuple, Any]" = collections.OrderedDict()
+        self._not_empty = asyncio.Event()
+        self._has_capacity = asyncio.Event()
+        self._has_capacity.set()
+        self._unfinished = 0
+        self._in_flight = 0  # critical/main events handed out by get(), not yet task_done()
+        self.stats = {"enqueued": 0, "critical": 0, "coalesced": 0, "shed": 0, "over_capacity": 0}
+
+    def qsize(self) -> int:
+        return len(self._main) + len(self._telemetry)
+
+    def empty(self) -> bool:
+        return not self._main and not self._telemetry
+
+    def _backlog(self) -> int:
+        return len(self._main) + self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def pressure(self) -> float:
+        """Critical + main (queued and in-flight) fill ratio; >= 1.0 means publishers should back off."""
+        return self._backlog() / self.maxsize
+
+    def put_nowait(self, event) -> bool:
+        """
+        Enqueue without blocking (handlers publish into their own scan queue, so
+        waiting here could deadlock the consumer).
+        Returns False when the caller should back off: the event was shed or the
+        main lane is over its soft bound.
+        """
+        name = _type_name(event)
+        if name in TELEMETRY_EVENTS:
+            if self._backlog() >= self.maxsize:
+                # Consumer is behind on real work; telemetry is the first thing to go
+                self.stats["shed"] += 1
+                return False
+            key = _coalesce_key(event)
+            if key in self._telemetry:
+                self.stats["coalesced"] += 1
+                self._telemetry.move_to_end(key)
+            else:
+                if len(self._telemetry) >= self.telemetry_capacity:
+                    self._telemetry.popitem(last=False)
+                    self.stats["shed"] += 1
+                self._unfinished += 1
+            self._telemetry[key] = event
+        else:
+            if name in CRITICAL_EVENTS:
+                self.stats["critical"] += 1
+            # One FIFO for both: jumping critical events ahead would break causal order
+            self._main.append(event)
+            self._unfinished += 1
+            if self._backlog() >= self.maxsize:
+                self.stats["over_capacity"] += 1
+                self._has_capacity.clear()
+        self.stats["enqueued"] += 1
+        self._not_empty.set()
+        return self._backlog() < self.maxsize
+
+    async def put(self, event) -> bool:
+        return self.put_nowait(event)
+
+    async def get(self):
+        while self.empty():
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        if self._main:
+            # Still counts toward the bound until the consumer calls task_done(event)
+            event = self._main.popleft()
+            self._in_flight += 1
+        else:
+            _, event = self._telemetry.popitem(last=False)
+        return event
+
+    def task_done(self, event=None):
+        """Mark an event from get() as fully handled; pass it so its critical/main slot is released."""
+        if self._unfinished > 0:
+            self._unfinished -= 1
+        if event is not None and _type_name(event) not in TELEMETRY_EVENTS and self._in_flight > 0:
+            self._in_flight -= 1
+            if self._backlog() < self.maxsize:
+                self._has_capacity.set()
+
+    async def wait_for_capacity(self):
+        """For producers outside the consumer loop: park until critical + main drain below the bound."""
+        await self._has_capacity.wait()
+
+
+class DedupWindow:
+    """
+    Exact sliding-window dedup: a FIFO ring of ids plus a set for O(1) lookups.
+    Bounded by count and optionally by age; eviction is always oldest-first.
+    """
+    def __init__(self, size: Optional[int] = None, ttl: Optional[float] = None):
+        self.size = size or settings.EVENTBUS_DEDUP_WINDOW
+        self.ttl = ttl if ttl is not None else settings.EVENTBUS_DEDUP_TTL
+        self._order: collections.deque = collections.deque()  # (id, inserted_at)
+        self._ids: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        cutoff = time.monotonic() - self.ttl
+        while self._order and self._order[0][1] < cutoff:
+            self._ids.discard(self._order.popleft()[0])
+
+    def __contains__(self, event_id: str) -> bool:
+        self._expire()
+        return event_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, event_id: str):
+        if event_id in self._ids:
+            return
+        self._ids.add(event_id)
+        self._order.append((event_id, time.monotonic()))
+        while len(self._order) > self.size:
+            self._ids.discard(self._order.popleft()[0])
+
+    def seen(self, event_id: str) -> bool:
+        """Check-and-record in one step. True means the id is a duplicate."""
+        if event_id in self:
+            self.hits += 1
+            return True
+        self.misses += 1
+        self.add(event_id)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
 
 class ScanContext:
     def __init__(self, scan_id: str = None):
@@ -12,10 +198,12 @@ class ScanContext:
         self.workflow_state: Dict[str, Any] = {}
         
         # 2. Causal Ordering (Fixes Invariant 21)
-        self.event_queue = asyncio.Queue()
+        # V7: Bounded, laned queue (critical never dropped, telemetry coalesced/shed)
+        self.event_queue = LanedEventQueue()
         
         # 3. Deduplication Window (Fixes Invariant 7)
-        self._recent_events: Set[str] = set()
+        # V7: Ordered window (the old set.pop() evicted an arbitrary id, not the oldest)
+        self._recent_events = DedupWindow()
         
         # 4. Cancellation Propagation (Fixes Invariant 24)
         self.is_cancelled: bool = False
@@ -1,11 +1,12 @@
 import asyncio
 import logging
-from typing import Callable, Dict, List, Any, Awaitable
-from pydantic import BaseModel, Field
+import time
+import itertools
+from typing import Callable, Dict, List, Any, Awaitable, Optional
 from enum import Enum
-import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import collections
+from backend.core.protocol import JobPacket
 
 # --- 1. THE VOCABULARY (Strict Schemas) ---
 
@@ -21,34 +22,150 @@ class EventType(str, Enum):
     CONTROL_SIGNAL = "CONTROL_SIGNAL"
     LIVE_ATTACK = "LIVE_ATTACK"
     REPORT_READY = "REPORT_READY"
+    VERDICT_CORRECTED = "VERDICT_CORRECTED"  # V7: LLM refinement overturned a speculative GI5 verdict
 
-class HiveEvent(BaseModel):
+# V7: Process-local monotonic event ids (cheaper than uuid4; only unique within one process)
+_event_ids = itertools.count(1)
+
+
+def _to_ns(value: Any) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)  # naive timestamps are UTC (utcnow convention)
+        return int(value.timestamp() * 1_000_000_000)
+    if isinstance(value, str):
+        return _to_ns(datetime.fromisoformat(value))
+    if isinstance(value, (int, float)):
+        return int(value * 1_000_000_000) if value < 1e12 else int(value)  # seconds or ns
+    raise TypeError(f"Unsupported timestamp: {value!r}")
+
+
+class HiveEvent:
     """
     The fundamental unit of communication.
     Every whisper in the hive must follow this structure.
+
+    V7: Plain __slots__ object instead of a pydantic model. Construction only
+    stores references (int id, time.time_ns()); conversion to dicts/datetimes is
+    deferred until the event leaves the process (journal, WebSocket, report).
     """
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    scan_id: str = "GLOBAL"  # CRITICAL FIX 2: Scan Context Isolation
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    type: EventType
-    source: str  # The Agent Name
-    payload: Dict[str, Any] = {}
+    __slots__ = ("id", "scan_id", "type", "source", "payload", "timestamp_ns", "_job_packet")
+
+    def __init__(self, type: EventType, source: str, payload: Optional[Dict[str, Any]] = None,
+                 scan_id: str = "GLOBAL", id: Any = None, timestamp: Any = None, timestamp_ns: Optional[int] = None):
+        self.type = type if isinstance(type, EventType) else EventType(type)
+        self.source = source  # The Agent Name
+        self.payload = payload if payload is not None else {}
+        self.scan_id = scan_id  # CRITICAL FIX 2: Scan Context Isolation
+        self.id = id if id is not None else next(_event_ids)
+        if timestamp_ns is None:
+            timestamp_ns = _to_ns(timestamp) if timestamp is not None else time.time_ns()
+        self.timestamp_ns = timestamp_ns
+        # Typed JOB_ASSIGNED view, validated once and shared by every consumer (read-only)
+        self._job_packet: Optional[JobPacket] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Naive UTC datetime, materialised on demand."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000, timezone.utc).replace(tzinfo=None)
+
+    def job_packet(self) -> JobPacket:
+        """Parse the payload as a JobPacket on first access; later calls reuse it."""
+        if self._job_packet is None:
+            self._job_packet = JobPacket(**self.payload)
+        return self._job_packet
+
+    def model_dump(self, mode: str = "python") -> Dict[str, Any]:
+        """Dict view (pydantic-compatible signature); mode="json" yields JSON-safe values."""
+        if mode == "json":
+            return {
+                "id": self.id,
+                "scan_id": self.scan_id,
+                "timestamp": self.timestamp.isoformat(),
+                "type": self.type.value,
+                "source": self.source,
+                "payload": self.payload,
+            }
+        return {
+            "id": self.id,
+            "scan_id": self.scan_id,
+            "timestamp": self.timestamp,
+            "type": self.type,
+            "source": self.source,
+            "payload": self.payload,
+        }
+
+    to_dict = model_dump
+
+    @classmethod
+    def model_validate(cls, data: Dict[str, Any]) -> "HiveEvent":
+        if "type" not in data or "source" not in data:
+            raise ValueError(f"HiveEvent requires 'type' and 'source': {data!r}")
+        return cls(
+            type=data["type"],
+            source=data["source"],
+            payload=data.get("payload") or {},
+            scan_id=data.get("scan_id", "GLOBAL"),
+            id=data.get("id"),
+            timestamp=data.get("timestamp"),
+        )
+
+    def __repr__(self) -> str:
+        return f"HiveEvent(id={self.id!r}, type={self.type.value}, source={self.source!r}, scan_id={self.scan_id!r})"
+
+# Per-type routing keys: subscribers registered with `route_key` only receive
+# events whose extracted key matches (e.g. a JOB_ASSIGNED goes to its owner agent).
+ROUTE_KEY_EXTRACTORS: Dict[EventType, Callable[[HiveEvent], Any]] = {
+    EventType.JOB_ASSIGNED: lambda event: event.job_packet().config.agent_id,
+}
 
 # --- 2. THE NERVOUS SYSTEM (Event Bus) ---
 
-from backend.core.context import ScanContext
+from backend.core.context import ScanContext, CRITICAL_EVENTS
+from backend.core.config import settings
 
 class EventBus:
     """
     The central message broker. 
     Decouples agents so they never talk directly.
+
+    Dispatch modes (per scan queue):
+    - "serial":   every handler is awaited one after another (strict global order).
+    - "parallel": handlers run concurrently; causal order is only kept per
+                  (handler, target URL) lane, bounded by a per-handler concurrency limit.
     """
-    def __init__(self):
+    def __init__(self, dispatch_mode: Optional[str] = None):
         self.subscribers: Dict[EventType, List[Callable[[HiveEvent], Awaitable[None]]]] = {}
-        self.history: List[HiveEvent] = [] # Optional: For replay/debugging
+        self.journal = None  # Optional EventJournal: records every accepted event (report input, replay)
+        self.tracer = None  # Optional callable(phase, event, handler, elapsed, failed) for replay/benchmarks
         self.scan_contexts: Dict[str, ScanContext] = {}
         self._context_tasks: Dict[str, asyncio.Task] = {}
         self._global_tasks = set()
+        self._global_capacity = asyncio.Event()  # Set while GLOBAL in-flight handlers are below the limit
+        self._global_capacity.set()
+        self._background_tasks = set()  # Work outside handlers that may still publish (see track_background)
+
+        # V7: Parallel dispatch state
+        self.dispatch_mode = dispatch_mode or settings.EVENTBUS_DISPATCH_MODE
+        self._handler_limits: Dict[Callable, int] = {}
+        self._handler_semaphores: Dict[Callable, asyncio.Semaphore] = {}
+        self._lane_tails: Dict[tuple, asyncio.Task] = {}  # (handler, target) -> last scheduled task
+        self._dispatch_tasks = set()
+
+        # V7: Type-indexed routing (event type -> route key -> handlers)
+        self._routed: Dict[EventType, Dict[Any, List[Callable[[HiveEvent], Awaitable[None]]]]] = {}
+        self._predicates: Dict[tuple, Callable[[HiveEvent], bool]] = {}  # (event type, handler) -> filter
+
+        # V7: Telemetry
+        self._handler_stats: Dict[str, Dict[str, Any]] = {}
+        self._peak_queue_depth: Dict[str, int] = {}
+        self._global_shed = 0
+        self._throttled = 0  # publish(throttle=True) calls that had to wait for capacity
+        self._throttle_timeouts = 0
+
+        # V7: Quiescence tracking (see wait_for_quiescence)
+        self._inflight = 0  # handlers currently executing
+        self._outstanding_jobs: Dict[Any, int] = {}  # job id -> owner handlers not yet returned
 
     def get_or_create_context(self, scan_id: str) -> ScanContext:
         if scan_id not in self.scan_contexts:
@@ -63,58 +180,375 @@ class EventBus:
         try:
             while not ctx.is_cancelled:
                 event = await ctx.event_queue.get()
-                if event.type in self.subscribers:
-                    handlers = self.subscribers[event.type]
+                handlers = self._handlers_for(event)
+                if handlers:
+                    self._track_job(event, handlers)
+                    if self.dispatch_mode == "parallel":
+                        # Fan out; ordering is preserved per (handler, target) lane.
+                        # The event holds its queue slot until every handler finishes,
+                        # so backpressure sees dispatched-but-unfinished work too.
+                        remaining = [len(handlers)]
+
+                        def _handled(_task, event=event, remaining=remaining):
+                            remaining[0] -= 1
+                            if remaining[0] == 0:
+                                ctx.event_queue.task_done(event)
+
+                        for handler in handlers:
+                            self._dispatch_ordered(handler, event).add_done_callback(_handled)
+                        continue
                     for handler in handlers:
                         # Wait strictly instead of fire-and-forget
                         await self._safe_execute(handler, event)
-                ctx.event_queue.task_done()
+                ctx.event_queue.task_done(event)
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logging.error(f"[EventBus] Scan Loop failed for {ctx.scan_id}: {e}")
 
-    def subscribe(self, event_type: EventType, handler: Callable[[HiveEvent], Awaitable[None]]):
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(handler)
+    @staticmethod
+    def _ordering_key(event: HiveEvent) -> Optional[str]:
+        """Target URL an event is about (None = untargeted, shares a single lane)."""
+        payload = event.payload or {}
+        url = payload.get("url") or payload.get("target_url")
+        if not url and isinstance(payload.get("target"), dict):
+            url = payload["target"].get("url")
+        return str(url).strip().lower() if url else None
+
+    def _dispatch_ordered(self, handler, event: HiveEvent) -> asyncio.Task:
+        """Schedule handler(event) behind the previous event on the same (handler, target) lane."""
+        lane = (handler, self._ordering_key(event))
+        previous = self._lane_tails.get(lane)
+        task = asyncio.create_task(self._run_in_lane(previous, handler, event))
+        self._lane_tails[lane] = task
+        self._dispatch_tasks.add(task)
+
+        def _release(t, lane=lane):
+            self._dispatch_tasks.discard(t)
+            if self._lane_tails.get(lane) is t:
+                del self._lane_tails[lane]
+        task.add_done_callback(_release)
+        return task
+
+    async def _run_in_lane(self, previous: Optional[asyncio.Task], handler, event: HiveEvent):
+        if previous is not None:
+            # Causal barrier: never overtake an earlier event for the same handler + target
+            await asyncio.wait([previous])
+        async with self._semaphore_for(handler):
+            await self._safe_execute(handler, event)
+
+    def _semaphore_for(self, handler) -> asyncio.Semaphore:
+        sem = self._handler_semaphores.get(handler)
+        if sem is None:
+            limit = self._handler_limits.get(handler, settings.EVENTBUS_HANDLER_CONCURRENCY)
+            sem = asyncio.Semaphore(max(1, int(limit)))
+            self._handler_semaphores[handler] = sem
+        return sem
+
+    def subscribe(self, event_type: EventType, handler: Callable[[HiveEvent], Awaitable[None]],
+                  max_concurrency: Optional[int] = None, route_key: Any = None,
+                  predicate: Optional[Callable[[HiveEvent], bool]] = None):
+        """
+        Register a handler for an event type.
+
+        route_key: deliver only events whose ROUTE_KEY_EXTRACTORS key equals this value
+                   (indexed lookup, no per-handler filtering cost).
+        predicate: deliver only events for which predicate(event) is truthy.
+        """
+        if route_key is not None:
+            if event_type not in ROUTE_KEY_EXTRACTORS:
+                raise ValueError(f"No route key extractor registered for {event_type}")
+            self._routed.setdefault(event_type, {}).setdefault(route_key, []).append(handler)
+        else:
+            if event_type not in self.subscribers:
+                self.subscribers[event_type] = []
+            self.subscribers[event_type].append(handler)
+            if predicate is not None:
+                self._predicates[(event_type, handler)] = predicate
+        if max_concurrency is not None:
+            self.set_handler_concurrency(handler, max_concurrency)
         # logging.debug(f"🔌 Handler subscribed to {event_type}")
 
+    def set_handler_concurrency(self, handler: Callable[[HiveEvent], Awaitable[None]], limit: int):
+        """Cap how many events a single handler may process at once (parallel mode)."""
+        self._handler_limits[handler] = limit
+        # Rebuilt lazily so in-flight holders of the old semaphore are not disturbed
+        self._handler_semaphores.pop(handler, None)
+
     def unsubscribe(self, event_type: EventType, handler: Callable[[HiveEvent], Awaitable[None]]):
         if event_type in self.subscribers and handler in self.subscribers[event_type]:
             self.subscribers[event_type].remove(handler)
+        self._predicates.pop((event_type, handler), None)
+        for handlers in self._routed.get(event_type, {}).values():
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def _route_key(self, event: HiveEvent) -> Any:
+        extractor = ROUTE_KEY_EXTRACTORS.get(event.type)
+        if extractor is None:
+            return None
+        try:
+            return extractor(event)
+        except Exception as e:
+            logging.warning(f"[EventBus] Unroutable {event.type} from {event.source}: {e}")
+            return None
+
+    def _accepts(self, handler, event: HiveEvent) -> bool:
+        predicate = self._predicates.get((event.type, handler))
+        if predicate is None:
+            return True
+        try:
+            return bool(predicate(event))
+        except Exception as e:
+            # A broken filter must not take down the dispatch loop; treat as not matched
+            logging.warning(f"[EventBus] Predicate for {getattr(handler, '__qualname__', handler)} "
+                            f"failed on {event.type} from {event.source}: {e}")
+            return False
+
+    def _handlers_for(self, event: HiveEvent) -> List[Callable[[HiveEvent], Awaitable[None]]]:
+        """Broadcast subscribers (minus filtered-out predicates) plus the routed owners."""
+        handlers = self.subscribers.get(event.type, [])
+        if self._predicates:
+            handlers = [h for h in handlers if self._accepts(h, event)]
+        else:
+            handlers = list(handlers)
+        routed = self._routed.get(event.type)
+        if routed:
+            key = self._route_key(event)
+            if key is not None and key in routed:
+                handlers.extend(routed[key])
+        return handlers
 
-    async def publish(self, event: HiveEvent):
+    async def publish(self, event: HiveEvent, throttle: bool = False) -> bool:
         """
         Broadcasts an event to all interested agents.
         Routes to purely causal queue isolation by default.
+
+        throttle: bulk producers (job fan-out) first wait, up to EVENTBUS_BACKPRESSURE_TIMEOUT,
+                  until the target queue has capacity; critical events never wait.
+
+        Returns the backpressure signal: False when the event was shed or the
+        scan queue is over its soft bound, so fast producers can throttle.
         """
+        if throttle and event.type.value not in CRITICAL_EVENTS:
+            await self._throttle(event.scan_id)
+        if self.tracer is not None:
+            self.tracer("publish", event, None, 0.0, False)
+        if event.type == EventType.JOB_COMPLETED:
+            self._outstanding_jobs.pop(event.payload.get("job_id"), None)
         if event.scan_id == "GLOBAL":
-            if event.type in self.subscribers:
-                for handler in self.subscribers[event.type]:
-                    task = asyncio.create_task(self._safe_execute(handler, event))
-                    self._global_tasks.add(task)
-                    task.add_done_callback(self._global_tasks.discard)
-            return
+            if self.journal is not None:
+                self.journal.append(event)
+            if (event.type in (EventType.LOG, EventType.LIVE_ATTACK)
+                    and len(self._global_tasks) >= settings.EVENTBUS_GLOBAL_INFLIGHT_LIMIT):
+                # V7: Shed telemetry instead of piling up unbounded handler tasks
+                self._global_shed += 1
+                return False
+            handlers = self._handlers_for(event)
+            self._track_job(event, handlers)
+            for handler in handlers:
+                task = asyncio.create_task(self._safe_execute(handler, event))
+                self._global_tasks.add(task)
+                task.add_done_callback(self._global_task_done)
+            if len(self._global_tasks) >= settings.EVENTBUS_GLOBAL_INFLIGHT_LIMIT:
+                self._global_capacity.clear()
+                return False
+            return True
             
         ctx = self.get_or_create_context(event.scan_id)
         
         # CRITICAL FIX 1: Exact-once deduplication window
-        if event.id in ctx._recent_events:
-            return  # Drop duplicate
+        if ctx._recent_events.seen(event.id):
+            return True  # Drop duplicate
             
-        ctx._recent_events.add(event.id)
-        if len(ctx._recent_events) > 1000:
-            ctx._recent_events.pop()
-            
-        # Enqueue for causal execution
-        await ctx.event_queue.put(event)
+        if self.journal is not None:
+            self.journal.append(event)
+
+        # Enqueue for causal execution (never blocks; see LanedEventQueue.put_nowait)
+        accepted = ctx.event_queue.put_nowait(event)
+        depth = ctx.event_queue.qsize()
+        if depth > self._peak_queue_depth.get(event.scan_id, 0):
+            self._peak_queue_depth[event.scan_id] = depth
+        return accepted
+
+    def _global_task_done(self, task: asyncio.Task):
+        self._global_tasks.discard(task)
+        if len(self._global_tasks) < settings.EVENTBUS_GLOBAL_INFLIGHT_LIMIT:
+            self._global_capacity.set()
+
+    def backpressure(self, scan_id: str) -> float:
+        """Fill ratio of a scan queue, or of the GLOBAL in-flight handler limit (0.0 for unknown scans)."""
+        if scan_id == "GLOBAL":
+            return len(self._global_tasks) / settings.EVENTBUS_GLOBAL_INFLIGHT_LIMIT
+        ctx = self.scan_contexts.get(scan_id)
+        return ctx.event_queue.pressure if ctx else 0.0
+
+    async def wait_for_capacity(self, scan_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Cooperative throttle for producers that are not handlers of the same scan
+        (those must not block on their own queue). Returns False on timeout.
+        """
+        if scan_id == "GLOBAL":
+            waiter = self._global_capacity.wait()
+        else:
+            ctx = self.scan_contexts.get(scan_id)
+            if ctx is None:
+                return True
+            waiter = ctx.event_queue.wait_for_capacity()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _throttle(self, scan_id: str):
+        # A serial scan loop awaits its handlers, so a handler parked on its own queue would
+        # deadlock it; GLOBAL handlers and parallel-mode handlers run off the consumer loop.
+        if scan_id != "GLOBAL" and self.dispatch_mode != "parallel":
+            return
+        if self.backpressure(scan_id) < 1.0:
+            return
+        self._throttled += 1
+        # Bounded: handlers waiting here still hold GLOBAL slots, so never wait forever
+        if not await self.wait_for_capacity(scan_id, settings.EVENTBUS_BACKPRESSURE_TIMEOUT):
+            self._throttle_timeouts += 1
 
     async def _safe_execute(self, handler, event):
+        start = time.perf_counter()
+        failed = False
+        self._inflight += 1
         try:
             await handler(event)
         except Exception as e:
+            failed = True
             logging.error(f"[CRITICAL] Handler failed processing {event.type}: {e}")
+        finally:
+            self._inflight -= 1
+            if event.type == EventType.JOB_ASSIGNED:
+                self._settle_job(event)
+            elapsed = time.perf_counter() - start
+            self._record_latency(handler, elapsed, failed)
+            if self.tracer is not None:
+                self.tracer("handled", event, handler, elapsed, failed)
+
+    def _record_latency(self, handler, elapsed: float, failed: bool):
+        name = getattr(handler, "__qualname__", None) or repr(handler)
+        stats = self._handler_stats.get(name)
+        if stats is None:
+            stats = {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0, "recent": collections.deque(maxlen=256)}
+            self._handler_stats[name] = stats
+        stats["calls"] += 1
+        stats["errors"] += int(failed)
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        stats["recent"].append(elapsed)
+
+    # --- V7: Quiescence detection ---
+
+    @staticmethod
+    def _job_id(event: HiveEvent):
+        try:
+            return event.job_packet().id
+        except Exception:
+            return None
+
+    def _track_job(self, event: HiveEvent, handlers: List[Callable]):
+        """A JOB_ASSIGNED with no receiver has no owner and never counts as outstanding."""
+        if event.type != EventType.JOB_ASSIGNED or not handlers:
+            return
+        job_id = self._job_id(event)
+        if job_id is not None:
+            self._outstanding_jobs[job_id] = self._outstanding_jobs.get(job_id, 0) + len(handlers)
+
+    def _settle_job(self, event: HiveEvent):
+        # Owners that return without a JOB_COMPLETED (e.g. Alpha/Beta) settle the job on return
+        job_id = self._job_id(event)
+        remaining = self._outstanding_jobs.get(job_id)
+        if remaining is None:
+            return
+        if remaining <= 1:
+            del self._outstanding_jobs[job_id]
+        else:
+            self._outstanding_jobs[job_id] = remaining - 1
+
+    def track_background(self, task: asyncio.Future):
+        """
+        V7: Registers work that runs outside any handler but may still publish into this
+        bus (e.g. a background LLM refinement that can end in VERDICT_CORRECTED); the
+        bus is not idle until it finishes.
+        """
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def wait_for_background(self, timeout: float) -> bool:
+        """Waits up to `timeout` seconds for tracked background work; True if none is left."""
+        if self._background_tasks:
+            await asyncio.wait(set(self._background_tasks), timeout=timeout)
+        return not self._background_tasks
+
+    def is_idle(self) -> bool:
+        """No handler running or scheduled, every scan queue drained, no outstanding job or background work."""
+        return (
+            self._inflight == 0
+            and not self._dispatch_tasks
+            and not self._global_tasks
+            and not self._background_tasks
+            and not self._outstanding_jobs
+            and not any(ctx.event_queue.qsize() for ctx in self.scan_contexts.values())
+        )
+
+    async def wait_for_quiescence(self, timeout: float, grace: Optional[float] = None, poll: float = 0.25) -> bool:
+        """
+        Returns True once the bus has stayed idle for `grace` seconds, or False when
+        `timeout` elapses first (the caller's upper bound, e.g. the scan duration).
+        """
+        grace = settings.SCAN_QUIESCENCE_GRACE if grace is None else grace
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        idle_since = None
+        while True:
+            now = loop.time()
+            if self.is_idle():
+                if idle_since is None:
+                    idle_since = now
+                if now - idle_since >= grace:
+                    return True
+            else:
+                idle_since = None
+            if now >= deadline:
+                return False
+            await asyncio.sleep(min(poll, max(deadline - now, 0.0)))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue-depth and handler-latency snapshot for monitoring."""
+        handlers = {}
+        for name, stats in self._handler_stats.items():
+            recent = sorted(stats["recent"])
+            p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+            handlers[name] = {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total"] / stats["calls"] * 1000, 2) if stats["calls"] else 0.0,
+                "p95_ms": round(p95 * 1000, 2),
+                "max_ms": round(stats["max"] * 1000, 2),
+            }
+        return {
+            "dispatch_mode": self.dispatch_mode,
+            "queue_depth": {sid: ctx.event_queue.qsize() for sid, ctx in self.scan_contexts.items()},
+            "peak_queue_depth": dict(self._peak_queue_depth),
+            "queue_lanes": {sid: dict(ctx.event_queue.stats, in_flight=ctx.event_queue.in_flight,
+                                      pressure=round(ctx.event_queue.pressure, 3))
+                            for sid, ctx in self.scan_contexts.items()},
+            "global_shed": self._global_shed,
+            "throttled": self._throttled,
+            "throttle_timeouts": self._throttle_timeouts,
+            "dedup": {sid: ctx._recent_events.stats() for sid, ctx in self.scan_contexts.items()},
+            "inflight_handlers": len(self._dispatch_tasks) + len(self._global_tasks),
+            "outstanding_jobs": len(self._outstanding_jobs),
+            "background_tasks": len(self._background_tasks),
+            "ordering_lanes": len(self._lane_tails),
+            "handlers": handlers,
+        }
 
     async def shutdown(self):
         """Gracefully waits for and cancels all pending EventBus tasks."""
@@ -124,9 +558,13 @@ class EventBus:
             task.cancel()
         for task in self._global_tasks:
             task.cancel()
+        for task in self._dispatch_tasks:
+            task.cancel()
             
         if self._global_tasks:
             await asyncio.gather(*self._global_tasks, return_exceptions=True)
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
         if self._context_tasks:
             await asyncio.gather(*self._context_tasks.values(), return_exceptions=True)
 
@@ -171,6 +609,12 @@ class BaseAgent:
         self.active = False
         self.status = "OFFLINE"
         
+        # V7: Further LLM calls from this agent resolve as "[CORTEX CANCELLED]" (GI5 fallback)
+        from backend.ai.cortex import CortexHandle
+        for value in vars(self).values():
+            if isinstance(value, CortexHandle):
+                value.cancel()
+
         for task in getattr(self, "_agent_tasks", []):
             task.cancel()
         if getattr(self, "_agent_tasks", []):
@@ -178,6 +622,25 @@ class BaseAgent:
             
         logging.info(f"💤 {self.name} is OFFLINE.")
 
+    def correction_handler(self, site: str, subject: Dict[str, Any], on_refined=None):
+        """
+        V7: `on_correction` callback for speculative Cortex verdicts. Publishes
+        VERDICT_CORRECTED, then awaits `on_refined(refined)` if given. Its `track`
+        attribute lets Cortex register the background refinement with this agent's
+        bus, so the scan does not end (and close its journal) before it.
+        """
+        async def publish(speculative: Dict[str, Any], refined: Dict[str, Any]):
+            print(f"[{self.name}] [CORTEX] Speculative {site} verdict corrected by LLM refinement.")
+            await self.bus.publish(HiveEvent(
+                type=EventType.VERDICT_CORRECTED,
+                source=self.name,
+                payload={"site": site, "subject": subject, "speculative": speculative, "refined": refined}
+            ))
+            if on_refined is not None:
+                await on_refined(refined)
+        publish.track = self.bus.track_background
+        return publish
+
     # --- ABSTRACT METHODS (Subclasses MUST implement these) ---
 
     async def setup(self):
@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import re
+import struct
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from backend.core.config import settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger("EventJournal")
+
+# File layout: MAGIC | codec byte | records...; each record is a 4-byte big-endian
+# length followed by one encoded event dict (HiveEvent.model_dump(mode="json")).
+MAGIC = b"HJNL"
+CODEC_JSON = b"J"
+CODEC_MSGPACK = b"M"
+_LEN = struct.Struct(">I")
+
+
+def _encode(codec: bytes, record: Dict[str, Any]) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(record, use_bin_type=True, default=str)
+    return json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode(codec: bytes, blob: bytes) -> Dict[str, Any]:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("Journal was written with msgpack, which is not installed")
+        return msgpack.unpackb(blob, raw=False)
+    return json.loads(blob)
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Streams event dicts from a journal file. A truncated tail record (crash mid-write) ends the stream."""
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+        if len(header) < len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not an event journal: {path}")
+        codec = header[len(MAGIC):]
+        while True:
+            prefix = f.read(_LEN.size)
+            if len(prefix) < _LEN.size:
+                return
+            (size,) = _LEN.unpack(prefix)
+            blob = f.read(size)
+            if len(blob) < size:
+                return
+            yield _decode(codec, blob)
+
+
+def prune_journals(directory: Optional[str] = None, keep: Optional[int] = None,
+                   max_age: Optional[float] = None, exclude: Iterable[str] = ()) -> int:
+    """
+    Retention for the journal directory: deletes journals older than `max_age` seconds,
+    then all but the `keep` most recently written. Returns the number deleted.
+    """
+    directory = directory or settings.EVENT_JOURNAL_DIR
+    keep = settings.EVENT_JOURNAL_KEEP if keep is None else keep
+    max_age = settings.EVENT_JOURNAL_MAX_AGE if max_age is None else max_age
+    excluded = {os.path.abspath(p) for p in exclude}
+    try:
+        entries = [e for e in os.scandir(directory)
+                   if e.is_file() and e.name.endswith(".journal") and os.path.abspath(e.path) not in excluded]
+    except FileNotFoundError:
+        return 0
+
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    cutoff = time.time() - max_age if max_age else None
+    deleted = 0
+    for rank, entry in enumerate(entries):
+        if (keep is not None and rank >= keep) or (cutoff is not None and entry.stat().st_mtime < cutoff):
+            try:
+                os.remove(entry.path)
+                deleted += 1
+            except OSError as e:
+                logger.warning(f"Could not prune journal {entry.path}: {e}")
+    return deleted
+
+
+class EventJournal:
+    """
+    Append-only, length-prefixed on-disk log of every event of one scan.
+
+    Replaces the in-memory `scan_events` list: the writer keeps only counters,
+    and iterating the journal re-reads it from disk, so consumers (report,
+    complete_scan, replay) stream it with constant memory.
+    """
+    def __init__(self, scan_id: str, directory: Optional[str] = None):
+        self.scan_id = scan_id
+        directory = directory or settings.EVENT_JOURNAL_DIR
+        os.makedirs(directory, exist_ok=True)
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", scan_id)
+        self.path = os.path.join(directory, f"{safe_id}.journal")
+        self.codec = CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC + self.codec)
+        self.count = 0
+        self.type_counts: Counter = Counter()
+        # The new journal counts towards EVENT_JOURNAL_KEEP (it is the newest)
+        keep = settings.EVENT_JOURNAL_KEEP
+        prune_journals(directory, keep=max(keep - 1, 0) if keep is not None else None, exclude=[self.path])
+
+    @classmethod
+    def open(cls, path: str) -> "EventJournal":
+        """Read-only handle on an existing journal (e.g. for replay)."""
+        journal = cls.__new__(cls)
+        journal.scan_id = os.path.splitext(os.path.basename(path))[0]
+        journal.path = path
+        journal._file = None
+        journal.type_counts = Counter(str(e.get("type")) for e in read_journal(path))
+        journal.count = sum(journal.type_counts.values())
+        with open(path, "rb") as f:
+            journal.codec = f.read(len(MAGIC) + 1)[len(MAGIC):]
+        return journal
+
+    def append(self, event) -> None:
+        if self._file is None:
+            return
+        record = event.model_dump(mode="json") if hasattr(event, "model_dump") else event
+        blob = _encode(self.codec, record)
+        self._file.write(_LEN.pack(len(blob)))
+        self._file.write(blob)
+        self.count += 1
+        self.type_counts[str(record.get("type"))] += 1
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Each iteration opens a fresh reader, so the journal can be consumed more than once
+        self.flush()
+        return read_journal(self.path)
+
+    def iter_types(self, types: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        wanted = {getattr(t, "value", t) for t in types}
+        return (e for e in self if e.get("type") in wanted)
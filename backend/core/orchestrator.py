@@ -23,18 +23,88 @@ from backend.agents.inspector import AgentIota # Agent Iota (The Inspector)
 # recorder removed - unused import cleanup V6
 from backend.core.reporting import ReportGenerator # The Voice
 # Hybrid AI Engine for campaign strategy
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 from backend.core.planner import MissionPlanner
+from backend.core.shard import shard_pool
+from backend.core.journal import EventJournal
+from backend.core.scheduler import scan_scheduler, current_budget
 
 logger = logging.getLogger("HiveOrchestrator")
-ai_cortex = CortexEngine()
+ai_cortex = CortexHandle("orchestrator")
 
 class HiveOrchestrator:
     # Global Registry for API Access (Nervous System)
     active_agents = {}
 
     @staticmethod
-    async def bootstrap_hive(target_config, scan_id=None):
+    async def apply_finding(scan_id: str, source: str, payload: dict):
+        """
+        Records a VULN_CONFIRMED in the global stats and pushes it to the UI.
+        Runs in the API process (locally, or on behalf of a shard worker).
+        """
+        # Update global stats immediately
+        # payload might be nested or direct
+        real_payload = payload
+        # Check if payload is wrapped in 'payload' key
+        if 'payload' in real_payload and isinstance(real_payload['payload'], dict):
+             # Flatten if needed, but usually real_payload is the dict we want
+             pass
+
+        severity = real_payload.get('severity', 'High')
+        # Passing normalized signature data to StateManager for robust deduplication
+        sig_data = {
+            "url": str(real_payload.get('url', '')).strip().lower(),
+            "type": str(real_payload.get('type', '')).upper(),
+            "data": str(real_payload.get('data', real_payload.get('payload', '')))
+        }
+        stats_db_manager.record_finding(scan_id, severity, sig_data)
+        
+        # Broadcast authoritative stats to UI
+        current_stats = stats_db_manager.get_stats()
+        await manager.broadcast({
+            "type": "VULN_UPDATE", 
+            "payload": {
+                "metrics": {
+                    "vulnerabilities": current_stats["vulnerabilities"],
+                    "critical": current_stats["critical"],
+                    "active_scans": current_stats["active_scans"], 
+                    "total_scans": current_stats["total_scans"]
+                },
+                "graph_data": current_stats["history"]
+            }
+        })
+
+        # V6: Persist Threat Metrics
+        threat_type = real_payload.get("type", "Unknown Threat")
+        risk_score = real_payload.get("data", {}).get("risk_score", 0)
+        stats_db_manager.record_threat(threat_type, risk_score)
+
+        # Broadcast LIVE THREAT LOG (New Feature)
+        await manager.broadcast({
+            "type": "LIVE_THREAT_LOG",
+            "payload": {
+                "agent": source, # e.g. "agent_theta" (Prism)
+                "threat_type": threat_type,
+                "url": real_payload.get("url", "Unknown Source"),
+                "severity": severity,
+                "timestamp": datetime.now().strftime("%H:%M:%S"),
+                "risk_score": risk_score
+            }
+        })
+
+    @staticmethod
+    async def launch_scan(target_config, scan_id=None):
+        """
+        Entry point for the API: runs the scan on a shard worker process when
+        HIVE_SHARDS > 0, otherwise in-process on the API loop.
+        """
+        if shard_pool.enabled:
+            await shard_pool.run_scan(target_config, scan_id)
+        else:
+            await HiveOrchestrator.bootstrap_hive(target_config, scan_id)
+
+    @staticmethod
+    async def bootstrap_hive(target_config, scan_id=None, event_sink=None):
         """
         Initializes the Antigravity V5 Singularity.
         """
@@ -42,6 +112,9 @@ class HiveOrchestrator:
         if not scan_id:
              scan_id = f"HIVE-V5-{int(start_time.timestamp())}"
 
+        # V7: Fair network/LLM share for everything this scan spawns (None when not scheduled)
+        current_budget.set(scan_scheduler.budget_for(scan_id))
+
         # 0. Register Scan (Idempotent Check)
         # Check if already registered by attack.py
         existing = next((s for s in stats_db_manager.get_stats()["scans"] if s["id"] == scan_id), None)
@@ -73,61 +146,17 @@ class HiveOrchestrator:
         bus = EventBus()
         
         # --- REPORTING LINK ---
-        scan_events = []
+        # V7: Events are journaled to disk by the bus instead of kept in memory
+        journal = EventJournal(scan_id)
+        bus.journal = journal
         async def event_listener(event: HiveEvent):
-            scan_events.append(event.model_dump())
-            
             # REAL-TIME DASHBOARD SYNC
             if event.type == EventType.VULN_CONFIRMED:
-                # Update global stats immediately
-                # payload might be nested or direct
-                real_payload = event.payload
-                # Check if payload is wrapped in 'payload' key
-                if 'payload' in real_payload and isinstance(real_payload['payload'], dict):
-                     # Flatten if needed, but usually real_payload is the dict we want
-                     pass
-
-                severity = real_payload.get('severity', 'High')
-                # Passing normalized signature data to StateManager for robust deduplication
-                sig_data = {
-                    "url": str(real_payload.get('url', '')).strip().lower(),
-                    "type": str(real_payload.get('type', '')).upper(),
-                    "data": str(real_payload.get('data', real_payload.get('payload', '')))
-                }
-                stats_db_manager.record_finding(scan_id, severity, sig_data)
-                
-                # Broadcast authoritative stats to UI
-                current_stats = stats_db_manager.get_stats()
-                await manager.broadcast({
-                    "type": "VULN_UPDATE", 
-                    "payload": {
-                        "metrics": {
-                            "vulnerabilities": current_stats["vulnerabilities"],
-                            "critical": current_stats["critical"],
-                            "active_scans": current_stats["active_scans"], 
-                            "total_scans": current_stats["total_scans"]
-                        },
-                        "graph_data": current_stats["history"]
-                    }
-                })
-
-                # V6: Persist Threat Metrics
-                threat_type = real_payload.get("type", "Unknown Threat")
-                risk_score = real_payload.get("data", {}).get("risk_score", 0)
-                stats_db_manager.record_threat(threat_type, risk_score)
-
-                # Broadcast LIVE THREAT LOG (New Feature)
-                await manager.broadcast({
-                    "type": "LIVE_THREAT_LOG",
-                    "payload": {
-                        "agent": event.source, # e.g. "agent_theta" (Prism)
-                        "threat_type": threat_type,
-                        "url": real_payload.get("url", "Unknown Source"),
-                        "severity": severity,
-                        "timestamp": datetime.now().strftime("%H:%M:%S"),
-                        "risk_score": risk_score
-                    }
-                })
+                if event_sink is not None:
+                    # V7 SHARD: findings are applied by the API process (see backend/core/shard.py)
+                    event_sink(event)
+                else:
+                    await HiveOrchestrator.apply_finding(scan_id, event.source, event.payload)
                 
             elif event.type == EventType.VULN_CANDIDATE:
                 real_payload = event.payload
@@ -249,11 +278,19 @@ class HiveOrchestrator:
         duration_val = target_config.get('duration')
         scan_duration = int(duration_val) if duration_val is not None else settings.SCAN_TIMEOUT
         scan_duration = max(scan_duration, 1) # Ensure at least 1s
+        run_started = asyncio.get_running_loop().time()
         try:
-            await asyncio.sleep(scan_duration)
+            # V7: End as soon as the hive is quiescent; the duration is only the upper bound
+            if await bus.wait_for_quiescence(timeout=scan_duration):
+                logger.info(f"Scan {scan_id} quiescent after {asyncio.get_running_loop().time() - run_started:.1f}s (limit {scan_duration}s)")
         except asyncio.CancelledError:
             pass
         finally:
+            # Speculative verdicts still being refined may publish VERDICT_CORRECTED: let them land
+            # while agents and the journal are still up (quiescence already waits; this covers the timeout)
+            if not await bus.wait_for_background(settings.SCAN_REFINEMENT_DRAIN):
+                logger.warning(f"Scan {scan_id}: background refinements still running after {settings.SCAN_REFINEMENT_DRAIN}s; their corrections will not be recorded")
+            scan_duration = round(asyncio.get_running_loop().time() - run_started, 2)
             await manager.broadcast({"type": "GI5_LOG", "payload": "Hyper-Mind: Mission Complete. Shutting down."})
             for agent in agents:
                 try:
@@ -272,14 +309,17 @@ class HiveOrchestrator:
             
             # Clear registry
             HiveOrchestrator.active_agents.clear()
+            journal.close()
+            bus_metrics = bus.get_metrics()
+            logger.info(f"EventBus metrics for {scan_id}: peak_queue_depth={bus_metrics['peak_queue_depth']} handlers={len(bus_metrics['handlers'])}")
             print(f"[Orchestrator] Scan {scan_id} Cleaned Up. Listeners detached.")
             
             # --- GENERATE GOD MODE REPORT ---
             try:
-                items_found = [e for e in scan_events if e.get('type') in (EventType.VULN_CONFIRMED, "VULN_CONFIRMED")]
+                items_found = journal.iter_types([EventType.VULN_CONFIRMED])  # streamed, consumed once
                 # V6: complete_scan now sets status to 'Finalizing'
                 stats_db_manager.complete_scan(scan_id, items_found, scan_duration)
-                await manager.broadcast({"type": "SCAN_UPDATE", "payload": {"id": scan_id, "status": "Finalizing"}})
+                await manager.broadcast({"type": "SCAN_UPDATE", "payload": {"id": scan_id, "status": "Finalizing", "duration": scan_duration}})
             except Exception as e:
                 logger.error(f"Failed to record complete_scan (Finalizing): {e}")
 
@@ -296,17 +336,18 @@ class HiveOrchestrator:
                             "start_time": start_time.strftime("%Y-%m-%d %H:%M:%S"),
                             "end_time": end_time.strftime("%Y-%m-%d %H:%M:%S"),
                             "duration": f"{scan_duration}s",
-                            "total_requests": len(scan_events),
+                            "total_requests": len(journal),
                             "avg_latency_ms": "N/A",
                             "peak_concurrency": len(agents),
                             "ai_calls": 0,
                             "llm_avg_latency": "N/A",
                             "circuit_breaker_activations": 0,
+                            "eventbus": bus_metrics,
                         }
                         
                         # V6: Add 900s hard timeout (15 mins)
                         await asyncio.wait_for(
-                            report_gen.generate_report(scan_id, scan_events, target_config['url'], telemetry=telemetry),
+                            report_gen.generate_report(scan_id, journal, target_config['url'], telemetry=telemetry),
                             timeout=900.0
                         )
                         
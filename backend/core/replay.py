@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from backend.core.hive import EventBus, HiveEvent
+from backend.core.journal import EventJournal
+
+logger = logging.getLogger("HiveReplay")
+
+# Payload fields that carry the scanned target (rewritten by `rebase_url`)
+_URL_FIELDS = ("url", "target_url")
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+class ReplayEngine:
+    """
+    Feeds a recorded EventJournal into a fresh EventBus at controlled speed and
+    measures what the hive does with it.
+
+    - speed: 1.0 replays with the recorded inter-event gaps, 10.0 ten times faster,
+      None (or <= 0) as fast as possible.
+    - sources: only replay events published by these sources (e.g. {"Orchestrator"})
+      and let the attached agents regenerate the rest; None replays everything.
+    - rebase_url: rewrite recorded target URLs onto a stub server (scheme + host).
+
+    Latency is end-to-end per event: from publish until the last handler that
+    received it returns (including events the agents publish during the replay).
+    """
+    def __init__(self, journal: Union[EventJournal, str, Iterable[Dict[str, Any]]], bus: Optional[EventBus] = None,
+                 agents: Optional[List[Any]] = None, speed: Optional[float] = 1.0,
+                 sources: Optional[Iterable[str]] = None, rebase_url: Optional[str] = None):
+        self.journal = EventJournal.open(journal) if isinstance(journal, str) else journal
+        self.bus = bus or EventBus()
+        self.agents = agents or []
+        self.speed = speed if speed and speed > 0 else None
+        self.sources = set(sources) if sources else None
+        self.rebase = urlsplit(rebase_url) if rebase_url else None
+
+        self._published_at: Dict[str, float] = {}
+        self._event_types: Dict[str, str] = {}
+        self._last_handled: Dict[str, float] = {}
+        self._handler_calls = 0
+        self._handler_errors = 0
+        self._replayed = 0
+        self._skipped = 0
+
+    # --- Tracing ---
+
+    def _trace(self, phase: str, event: HiveEvent, handler, elapsed: float, failed: bool):
+        now = time.perf_counter()
+        if phase == "publish":
+            self._published_at.setdefault(event.id, now)
+            self._event_types.setdefault(event.id, getattr(event.type, "value", str(event.type)))
+        elif phase == "handled":
+            self._handler_calls += 1
+            self._handler_errors += int(failed)
+            self._last_handled[event.id] = now
+
+    # --- Event reconstruction ---
+
+    def _rebased(self, url: Any) -> Any:
+        if not self.rebase or not isinstance(url, str) or "://" not in url:
+            return url
+        parts = urlsplit(url)
+        return urlunsplit((self.rebase.scheme, self.rebase.netloc, parts.path, parts.query, parts.fragment))
+
+    def _to_event(self, record: Dict[str, Any]) -> Optional[HiveEvent]:
+        try:
+            # Fresh id: recorded ids are process-local and could collide with live ones
+            event = HiveEvent.model_validate(dict(record, id=None))
+        except Exception as e:
+            logger.warning(f"[Replay] Skipping unreadable record {record.get('id')}: {e}")
+            return None
+        if self.rebase:
+            payload = dict(event.payload)
+            for key in _URL_FIELDS:
+                if key in payload:
+                    payload[key] = self._rebased(payload[key])
+            target = payload.get("target")
+            if isinstance(target, dict) and "url" in target:
+                payload["target"] = dict(target, url=self._rebased(target["url"]))
+            event.payload = payload
+        return event
+
+    @staticmethod
+    def _recorded_ts(record: Dict[str, Any]) -> Optional[float]:
+        ts = record.get("timestamp")
+        if isinstance(ts, (int, float)):
+            return float(ts)
+        if isinstance(ts, str):
+            try:
+                return datetime.fromisoformat(ts).timestamp()
+            except ValueError:
+                return None
+        return None
+
+    # --- Run ---
+
+    async def run(self, drain_timeout: float = 30.0) -> Dict[str, Any]:
+        self.bus.tracer = self._trace
+        for agent in self.agents:
+            await agent.start()
+
+        first_recorded = None
+        wall_start = time.perf_counter()
+        try:
+            for record in self.journal:
+                if self.sources is not None and record.get("source") not in self.sources:
+                    self._skipped += 1
+                    continue
+                event = self._to_event(record)
+                if event is None:
+                    self._skipped += 1
+                    continue
+
+                if self.speed is not None:
+                    recorded = self._recorded_ts(record)
+                    if recorded is not None:
+                        if first_recorded is None:
+                            first_recorded = recorded
+                        due = wall_start + (recorded - first_recorded) / self.speed
+                        delay = due - time.perf_counter()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+
+                await self.bus.publish(event)
+                self._replayed += 1
+            publish_done = time.perf_counter()
+            drained = await self.bus.wait_for_quiescence(drain_timeout, grace=0.15, poll=0.05)
+        finally:
+            for agent in self.agents:
+                try:
+                    await asyncio.wait_for(agent.stop(), timeout=5.0)
+                except Exception as e:
+                    logger.error(f"[Replay] Failed to stop agent {getattr(agent, 'name', agent)}: {e}")
+            self.bus.tracer = None
+
+        wall = time.perf_counter() - wall_start
+        return self._report(wall, publish_done - wall_start, drained)
+
+    def _report(self, wall: float, publish_wall: float, drained: bool) -> Dict[str, Any]:
+        per_type: Dict[str, List[float]] = {}
+        for event_id, published in self._published_at.items():
+            done = self._last_handled.get(event_id)
+            if done is not None:
+                per_type.setdefault(self._event_types[event_id], []).append(done - published)
+
+        latency = {}
+        for etype, values in sorted(per_type.items()):
+            values.sort()
+            latency[etype] = {
+                "count": len(values),
+                "avg_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+
+        total_events = len(self._published_at)
+        return {
+            "speed": self.speed or "max",
+            "replayed": self._replayed,
+            "skipped": self._skipped,
+            "events_total": total_events,
+            "generated": max(total_events - self._replayed, 0),
+            "handler_calls": self._handler_calls,
+            "handler_errors": self._handler_errors,
+            "drained": drained,
+            "wall_s": round(wall, 3),
+            "replay_throughput_eps": round(self._replayed / publish_wall, 1) if publish_wall > 0 else 0.0,
+            "handled_throughput_eps": round(total_events / wall, 1) if wall > 0 else 0.0,
+            "latency": latency,
+            "eventbus": self.bus.get_metrics(),
+        }
@@ -3,13 +3,13 @@ import os
 import asyncio
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Iterable
 import json
 from fpdf import FPDF
 # Hybrid AI Engine for intelligent reporting
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
 
-cortex = CortexEngine()
+cortex = CortexHandle("reporting", priority=PRIORITY_REPORT)
 
 class SecurityReportPDF(FPDF):
     """
@@ -317,13 +317,13 @@ class ReportGenerator:
         if cvss >= 4.0: return 'MEDIUM'
         return 'LOW'
 
-    async def generate_report(self, scan_id: str, events: List[Dict[str, Any]], target_url: str, telemetry: Dict[str, Any] = None):
+    async def generate_report(self, scan_id: str, events: Iterable[Dict[str, Any]], target_url: str, telemetry: Dict[str, Any] = None):
         """
         Generate the professional PDF report matching specimen PS_1-PS_4 images.
         
         Args:
             scan_id: Unique scan identifier
-            events: List of scan events
+            events: Scan events (list or EventJournal); read in a single streaming pass
             target_url: Target URL scanned
             telemetry: Optional dict with scan telemetry data
         """
@@ -342,7 +342,6 @@ class ReportGenerator:
             scan_start = telemetry.get('start_time', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
             scan_end = telemetry.get('end_time', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
             scan_duration = telemetry.get('duration', 'N/A')
-            total_requests = telemetry.get('total_requests', len(events))
             avg_latency = telemetry.get('avg_latency_ms', 'N/A')
             peak_concurrency = telemetry.get('peak_concurrency', 'N/A')
             ai_calls = telemetry.get('ai_calls', 0)
@@ -350,20 +349,26 @@ class ReportGenerator:
             circuit_breaker_activations = telemetry.get('circuit_breaker_activations', 0)
 
             # ================================================================
-            # DEDUPLICATE FINDINGS
+            # DEDUPLICATE FINDINGS (single pass; also collects count and timeline)
             # ================================================================
-            raw_vuln_events = [e for e in events if any(t in str(e.get('type', '')).upper() for t in ["VULN_CONFIRMED", "VULN_CANDIDATE", "HIDDEN_TEXT", "PROMPT_INJECTION"])]
-            
             grouped_findings = {}
-            for v in raw_vuln_events:
-                p = v.get('payload', {})
+            timeline_source = []
+            event_count = 0
+            for e in events:
+                event_count += 1
+                if len(timeline_source) < 50:
+                    timeline_source.append({k: e.get(k) for k in ('timestamp', 'source', 'agent', 'type') if k in e})
+                if not any(t in str(e.get('type', '')).upper() for t in ["VULN_CONFIRMED", "VULN_CANDIDATE", "HIDDEN_TEXT", "PROMPT_INJECTION"]):
+                    continue
+                p = e.get('payload', {})
                 v_type = str(p.get('type', '')).upper()
                 v_url = str(p.get('url', '')).strip().lower()
                 v_data = str(p.get('data', p.get('payload', '')))
                 # Hash-based deduplication
                 sig = hashlib.md5(json.dumps({'u': v_url, 't': v_type, 'd': v_data}, sort_keys=True, default=str).encode()).hexdigest()
                 if sig not in grouped_findings:
-                    grouped_findings[sig] = v
+                    grouped_findings[sig] = e
+            total_requests = telemetry.get('total_requests', event_count)
             
             vuln_events = list(grouped_findings.values())
             total_vulns = len(vuln_events)
@@ -478,13 +483,30 @@ class ReportGenerator:
                 pdf.add_section_title("Detailed Findings")
                 
                 # Group findings by category for FILTER headers
+                # V7: One batched categorization instead of one LLM round trip per finding
                 categories = {}
-                for vn in vuln_events:
-                    payload_v = vn.get('payload', {})
-                    vt = str(payload_v.get('type', 'UNKNOWN')).upper()
-                    cat = await cortex.categorize_vulnerability(vt)
+                vuln_types = [str(vn.get('payload', {}).get('type', 'UNKNOWN')).upper() for vn in vuln_events]
+                for vn, cat in zip(vuln_events, await cortex.categorize_vulnerabilities(vuln_types)):
                     categories.setdefault(cat, []).append(vn)
 
+                # V7: AI enrichment for the first 10 findings (page order), issued up front:
+                # CVSS adjustments share one batched prompt, the per-finding generators run concurrently.
+                enriched = []
+                for v in [v for cat_findings in categories.values() for v in cat_findings][:10]:
+                    payload = v.get('payload', {})
+                    enriched.append((
+                        str(payload.get('type', 'UNKNOWN')).upper(),
+                        str(payload.get('payload', payload.get('data', 'N/A'))),
+                        str(payload.get('url', target_url)).strip().lower(),
+                    ))
+                ai_results = await asyncio.gather(
+                    cortex.adjust_cvss_scores([(self._lookup_cwe(vt)['base_cvss'], vt, url) for vt, _, url in enriched]),
+                    cortex.generate_vulnerability_summaries(enriched),
+                    asyncio.gather(*(cortex.reconstruct_forensic_evidence(vt, data, "HTTP/1.1 200 OK", url) for vt, data, url in enriched)),
+                    asyncio.gather(*(cortex.generate_remediation_code(vt, "Web Framework") for vt, _, _ in enriched)),
+                )
+                ai_scores, ai_summaries, ai_recons, ai_remedies = ai_results
+
                 finding_count = 0
                 for cat_name, cat_findings in categories.items():
                     pdf.add_filter_header(cat_name)
@@ -513,7 +535,7 @@ class ReportGenerator:
                         # AI-adjusted CVSS
                         score_raw = base_cvss
                         if finding_count <= 10:
-                            score_raw = await cortex.adjust_cvss_score(base_cvss, v_type, v_url)
+                            score_raw = ai_scores[finding_count - 1]
                         cvss_score = round(float(score_raw), 1) if score_raw else base_cvss
                         severity = self._classify_severity(cvss_score)
                         threat_score = int(cvss_score * 10)
@@ -524,9 +546,9 @@ class ReportGenerator:
                         remedy = "# Remediation: Ensure all inputs are validated against a strict schema."
                         
                         if finding_count <= 10:
-                            summary = await cortex.generate_vulnerability_summary(v_type, str(v_data), v_url)
-                            recon = await cortex.reconstruct_forensic_evidence(v_type, str(v_data), "HTTP/1.1 200 OK", v_url)
-                            remedy = await cortex.generate_remediation_code(v_type, "Web Framework")
+                            summary = ai_summaries[finding_count - 1]
+                            recon = ai_recons[finding_count - 1]
+                            remedy = ai_remedies[finding_count - 1]
                         
                         # ---- FINDING HEADER (Specimen PS_2 top) ----
                         pdf.add_finding_header(finding_count, finding_name)
@@ -631,12 +653,18 @@ class ReportGenerator:
             pdf.add_section_title("Scan Timeline")
             pdf.ln(5)
             timeline_events = []
-            for e in events[:50]:
+            for e in timeline_source:
                 ts_raw = e.get('timestamp', None)
                 if isinstance(ts_raw, datetime):
                     ts = ts_raw.strftime('%Y-%m-%d %H:%M:%S')
                 elif isinstance(ts_raw, (int, float)):
                     ts = datetime.fromtimestamp(ts_raw).strftime('%Y-%m-%d %H:%M:%S')
+                elif isinstance(ts_raw, str):
+                    # Journaled events carry ISO timestamps
+                    try:
+                        ts = datetime.fromisoformat(ts_raw).strftime('%Y-%m-%d %H:%M:%S')
+                    except ValueError:
+                        ts = ts_raw
                 else:
                     ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 
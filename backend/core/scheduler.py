@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.core.config import settings
+
+logger = logging.getLogger("ScanScheduler")
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+# Relative cost per selected module; an empty selection runs the full swarm
+MODULE_COST_WEIGHT = 0.5
+FULL_SWARM_MODULES = 9
+# Seconds of waiting that buy one priority level (keeps cheap scans from starving big ones)
+AGING_SECONDS = 60.0
+
+
+class FairShareGate:
+    """
+    Async context manager whose capacity is recomputed on every acquire, so a
+    scan's slice of a shared budget grows and shrinks as other scans come and go.
+    """
+    def __init__(self, limit: Callable[[], int]):
+        self._limit = limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit())
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    async def refresh(self):
+        """Wakes waiters after the share changed."""
+        async with self._cond:
+            self._cond.notify_all()
+
+
+class ScanBudget:
+    """Per-running-scan fair shares of the network and Ollama budgets."""
+    def __init__(self, scheduler: "ScanScheduler", scan_id: str):
+        self.scan_id = scan_id
+        self.net = FairShareGate(scheduler.net_share)
+        self.llm = FairShareGate(scheduler.llm_share)
+
+
+# Set by bootstrap_hive; inherited by every task the scan's bus and agents spawn
+current_budget: contextvars.ContextVar[Optional[ScanBudget]] = contextvars.ContextVar("current_budget", default=None)
+
+
+class ScanScheduler:
+    """
+    Admission control for scans.
+
+    At most SCAN_MAX_CONCURRENT scans run at once; the rest wait in a priority
+    queue ordered by (priority - aging, estimated cost, arrival). Running scans
+    split MAX_CONCURRENCY network slots and LLM_CONCURRENCY_BUDGET Ollama slots
+    evenly (see ScanBudget / current_budget).
+    """
+    def __init__(self, max_running: Optional[int] = None):
+        self.max_running = max_running or settings.SCAN_MAX_CONCURRENT
+        self._pending: List[Dict[str, Any]] = []
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._budgets: Dict[str, ScanBudget] = {}
+        self._seq = itertools.count()
+        self._tasks = set()
+        self._admitted = 0
+        self._completed = 0
+        self._total_wait = 0.0
+
+    # --- Cost & shares ---
+
+    @staticmethod
+    def estimate_cost(target_config: Dict[str, Any]) -> float:
+        duration_val = target_config.get("duration")
+        duration = int(duration_val) if duration_val is not None else settings.SCAN_TIMEOUT
+        modules = target_config.get("modules") or []
+        module_count = len(modules) if modules else FULL_SWARM_MODULES
+        return max(duration, 1) * (1 + MODULE_COST_WEIGHT * module_count)
+
+    def net_share(self) -> int:
+        return max(1, settings.MAX_CONCURRENCY // max(1, len(self._running)))
+
+    def llm_share(self) -> int:
+        return max(1, settings.LLM_CONCURRENCY_BUDGET // max(1, len(self._running)))
+
+    def budget_for(self, scan_id: str) -> Optional[ScanBudget]:
+        return self._budgets.get(scan_id)
+
+    # --- Queueing ---
+
+    async def submit(self, target_config: Dict[str, Any], scan_id: str, priority: int = PRIORITY_NORMAL) -> Dict[str, Any]:
+        """Queues a scan and returns immediately with its admission state."""
+        if scan_id in self._running:
+            return {"state": "running", "position": 0}
+        if any(e["scan_id"] == scan_id for e in self._pending):
+            return {"state": "queued", "position": self.position(scan_id)}
+        entry = {
+            "scan_id": scan_id,
+            "config": target_config,
+            "priority": priority,
+            "cost": self.estimate_cost(target_config),
+            "seq": next(self._seq),
+            "submitted": time.monotonic(),
+        }
+        self._pending.append(entry)
+        await self._dispatch()
+        if scan_id in self._running:
+            return {"state": "running", "position": 0}
+
+        position = self.position(scan_id)
+        from backend.api.socket_manager import manager
+        await manager.broadcast({"type": "SCAN_UPDATE", "payload": {"id": scan_id, "status": "Queued"}})
+        print(f"[Scheduler] Scan {scan_id} queued (position {position}, est. cost {entry['cost']:.0f}).")
+        return {"state": "queued", "position": position}
+
+    def position(self, scan_id: str) -> int:
+        """1-based place in admission order (0 when not queued)."""
+        now = time.monotonic()
+        ordered = sorted(self._pending, key=lambda e: self._sort_key(e, now))
+        return next((i for i, e in enumerate(ordered, 1) if e["scan_id"] == scan_id), 0)
+
+    def _sort_key(self, entry: Dict[str, Any], now: float):
+        aged = entry["priority"] - int((now - entry["submitted"]) // AGING_SECONDS)
+        return (aged, entry["cost"], entry["seq"])
+
+    async def _dispatch(self):
+        now = time.monotonic()
+        self._pending.sort(key=lambda e: self._sort_key(e, now))
+        while self._pending and len(self._running) < self.max_running:
+            entry = self._pending.pop(0)
+            self._total_wait += now - entry["submitted"]
+            self._admitted += 1
+            self._running[entry["scan_id"]] = entry
+            self._budgets[entry["scan_id"]] = ScanBudget(self, entry["scan_id"])
+            task = asyncio.create_task(self._run(entry))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await self._refresh_gates()
+
+    async def _refresh_gates(self):
+        for budget in self._budgets.values():
+            await budget.net.refresh()
+            await budget.llm.refresh()
+
+    async def _run(self, entry: Dict[str, Any]):
+        from backend.core.orchestrator import HiveOrchestrator
+        scan_id = entry["scan_id"]
+        print(f"[Scheduler] Admitting scan {scan_id} ({len(self._running)}/{self.max_running} slots).")
+        try:
+            await HiveOrchestrator.launch_scan(entry["config"], scan_id)
+        except Exception as e:
+            logger.error(f"Scan {scan_id} failed: {e}")
+        finally:
+            self._running.pop(scan_id, None)
+            self._budgets.pop(scan_id, None)
+            self._completed += 1
+            await self._dispatch()
+
+    def get_status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "max_running": self.max_running,
+            "running": list(self._running),
+            "pending": [
+                {"scan_id": e["scan_id"], "priority": e["priority"], "cost": round(e["cost"], 1),
+                 "waiting_s": round(now - e["submitted"], 1)}
+                for e in sorted(self._pending, key=lambda e: self._sort_key(e, now))
+            ],
+            "completed": self._completed,
+            "avg_wait_s": round(self._total_wait / self._admitted, 2) if self._admitted else 0.0,
+            "net_share": self.net_share(),
+            "llm_share": self.llm_share(),
+        }
+
+
+scan_scheduler = ScanScheduler()
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+from backend.core.config import settings
+
+logger = logging.getLogger("HiveShards")
+
+# UI messages a worker relays back; everything else (live feed, graph pulses, GI5 logs)
+# stays inside the shard. Findings travel separately as "finding" messages.
+RELAYED_UI_MESSAGES = frozenset({"SCAN_UPDATE", "REPORT_READY"})
+
+_STOP = ("stop",)
+
+
+def _portable(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Payloads cross a process boundary; coerce anything unpicklable to JSON-safe values."""
+    return json.loads(json.dumps(payload, default=str))
+
+
+def _shard_main(index: int, inbox, outbox):
+    """
+    Worker process entry point: one event loop, one hive per assigned scan.
+    Runs in a freshly spawned interpreter, so all hive imports happen here.
+    """
+    from backend.core.state import stats_db_manager
+    from backend.api.socket_manager import manager
+
+    # The API process owns stats.json and the websocket clients
+    stats_db_manager.persist = False
+
+    def relay(data: dict):
+        if data.get("type") in RELAYED_UI_MESSAGES:
+            outbox.put(("ui", _portable(data)))
+
+    manager.relay = relay
+
+    async def worker_loop():
+        from backend.core.orchestrator import HiveOrchestrator
+
+        loop = asyncio.get_running_loop()
+        scans = set()
+
+        async def run(target_config, scan_id):
+            def sink(event):
+                outbox.put(("finding", scan_id, event.source, _portable(event.payload)))
+            try:
+                await HiveOrchestrator.bootstrap_hive(target_config, scan_id, event_sink=sink)
+            except Exception as e:
+                logger.error(f"[Shard {index}] Scan {scan_id} failed: {e}")
+            finally:
+                outbox.put(("done", scan_id))
+
+        while True:
+            msg = await loop.run_in_executor(None, inbox.get)
+            if msg == _STOP:
+                break
+            _, scan_id, target_config = msg
+            task = asyncio.create_task(run(target_config, scan_id))
+            scans.add(task)
+            task.add_done_callback(scans.discard)
+
+        for task in scans:
+            task.cancel()
+        if scans:
+            await asyncio.gather(*scans, return_exceptions=True)
+
+    print(f"[Shard {index}] Worker online.")
+    asyncio.run(worker_loop())
+
+
+class ShardPool:
+    """
+    Pins each scan to one of N worker processes, each running its own event loop,
+    EventBus and agent set, so CPU-bound GI5 work of concurrent scans uses separate cores.
+
+    Only summary traffic returns over the IPC queue:
+    - ("finding", scan_id, source, payload)  VULN_CONFIRMED, applied via HiveOrchestrator.apply_finding
+    - ("ui", message)                        SCAN_UPDATE / REPORT_READY, mirrored into stats_db_manager
+    - ("done", scan_id)                      scan phase finished (report may still be generating)
+    """
+    def __init__(self, shards: Optional[int] = None):
+        self.size = settings.HIVE_SHARDS if shards is None else shards
+        self._mp = multiprocessing.get_context("spawn")
+        self._procs: List[Any] = []
+        self._inboxes: List[Any] = []
+        self._outbox = None
+        self._pump_task: Optional[asyncio.Task] = None
+
+        self._assignments: Dict[str, int] = {}  # scan_id -> shard index
+        self._load: List[int] = []
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._findings: Dict[str, List[Dict[str, Any]]] = {}
+        self._durations: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _start(self):
+        if self._procs:
+            return
+        self._outbox = self._mp.Queue()
+        for index in range(self.size):
+            self._spawn(index)
+        self._load = [0] * self.size
+        self._pump_task = asyncio.create_task(self._pump())
+        logger.info(f"ShardPool started with {self.size} worker processes")
+
+    def _spawn(self, index: int):
+        # Fresh inbox too: a dead worker's queue may still hold scans it never picked up
+        inbox = self._mp.Queue()
+        proc = self._mp.Process(target=_shard_main, args=(index, inbox, self._outbox), daemon=True,
+                                name=f"hive-shard-{index}")
+        proc.start()
+        if index < len(self._procs):
+            self._inboxes[index] = inbox
+            self._procs[index] = proc
+        else:
+            self._inboxes.append(inbox)
+            self._procs.append(proc)
+
+    def _revive_dead(self):
+        """Respawns crashed workers, so a dead shard (lowest load) does not attract every new scan."""
+        for index, proc in enumerate(self._procs):
+            if not proc.is_alive():
+                logger.warning(f"[ShardPool] Shard {index} died (exit code {proc.exitcode}); respawning")
+                self._spawn(index)
+
+    def _pick_shard(self) -> int:
+        # Least-loaded shard; ties go to the lowest index
+        return min(range(self.size), key=lambda i: (self._load[i], i))
+
+    async def run_scan(self, target_config: Dict[str, Any], scan_id: str):
+        """Dispatches a scan to a shard and waits until its scan phase has finished."""
+        self._start()
+        self._revive_dead()
+        shard = self._pick_shard()
+        self._assignments[scan_id] = shard
+        self._load[shard] += 1
+        self._findings[scan_id] = []
+        duration_val = target_config.get('duration')
+        self._durations[scan_id] = max(int(duration_val) if duration_val is not None else settings.SCAN_TIMEOUT, 1)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        done = loop.create_future()
+        self._pending[scan_id] = done
+        self._inboxes[shard].put(("scan", scan_id, _portable(target_config)))
+        proc = self._procs[shard]  # The worker this scan runs on, even if the slot is respawned later
+        print(f"[ShardPool] Scan {scan_id} pinned to shard {shard}.")
+        while not done.done():
+            await asyncio.wait({done}, timeout=5.0)
+            if not done.done() and not proc.is_alive():
+                # Worker crashed: release the slot instead of waiting forever
+                self._pending.pop(scan_id, None)
+                self._assignments.pop(scan_id, None)
+                self._load[shard] -= 1
+                self._revive_dead()
+                await self._interrupt(scan_id, loop.time() - started)
+                raise RuntimeError(f"Shard {shard} died while running scan {scan_id}")
+
+    async def _interrupt(self, scan_id: str, duration: float):
+        """Closes the record of a scan whose worker died: keeps findings relayed so far, releases active_scans."""
+        from backend.core.state import stats_db_manager
+        from backend.api.socket_manager import manager
+
+        self._durations.pop(scan_id, None)
+        stats_db_manager.complete_scan(scan_id, self._findings.pop(scan_id, []), duration)
+        # Same terminal status reset_stale_scans gives scans lost to an API restart
+        for s in stats_db_manager._stats["scans"]:
+            if s["id"] == scan_id:
+                s["status"] = "Interrupted"
+                stats_db_manager._save()
+                break
+        await manager.broadcast({"type": "SCAN_UPDATE", "payload": {"id": scan_id, "status": "Interrupted",
+                                                                    "duration": round(duration, 2)}})
+
+    async def _pump(self):
+        """Single reader for the shared outbox; applies worker summaries on the API loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            msg = await loop.run_in_executor(None, self._outbox.get)
+            if msg == _STOP:
+                return
+            try:
+                await self._apply(msg)
+            except Exception as e:
+                logger.error(f"[ShardPool] Failed to apply {msg[0]}: {e}")
+
+    async def _apply(self, msg: tuple):
+        from backend.core.orchestrator import HiveOrchestrator
+        from backend.core.state import stats_db_manager
+        from backend.api.socket_manager import manager
+
+        kind = msg[0]
+        if kind == "finding":
+            _, scan_id, source, payload = msg
+            self._findings.setdefault(scan_id, []).append(
+                {"type": "VULN_CONFIRMED", "source": source, "payload": payload}
+            )
+            await HiveOrchestrator.apply_finding(scan_id, source, payload)
+
+        elif kind == "ui":
+            data = msg[1]
+            if data.get("type") == "SCAN_UPDATE":
+                scan_id = data["payload"].get("id")
+                status = data["payload"].get("status")
+                if status == "Finalizing":
+                    duration = data["payload"].get("duration", self._durations.get(scan_id, settings.SCAN_TIMEOUT))
+                    self._durations.pop(scan_id, None)
+                    stats_db_manager.complete_scan(scan_id, self._findings.pop(scan_id, []), duration)
+                elif status == "Completed":
+                    stats_db_manager.mark_report_ready(scan_id)
+                for s in stats_db_manager._stats["scans"]:
+                    if s["id"] == scan_id and status in ("Running", "Completed"):
+                        s["status"] = status
+                        stats_db_manager._save()
+                        break
+            await manager.broadcast(data)
+
+        elif kind == "done":
+            scan_id = msg[1]
+            shard = self._assignments.pop(scan_id, None)
+            if shard is not None:
+                self._load[shard] -= 1
+            done = self._pending.pop(scan_id, None)
+            if done and not done.done():
+                done.set_result(None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "shards": self.size,
+            "alive": sum(1 for p in self._procs if p.is_alive()),
+            "load": list(self._load),
+            "assignments": dict(self._assignments),
+        }
+
+    async def shutdown(self):
+        if not self._procs:
+            return
+        for inbox in self._inboxes:
+            inbox.put(_STOP)
+        self._outbox.put(_STOP)
+        if self._pump_task:
+            await asyncio.gather(self._pump_task, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        for proc in self._procs:
+            await loop.run_in_executor(None, proc.join, 5.0)
+            if proc.is_alive():
+                proc.terminate()
+        for done in self._pending.values():
+            if not done.done():
+                done.cancel()
+        self._procs.clear()
+        self._inboxes.clear()
+        self._pending.clear()
+        print("[ShardPool] All shard workers stopped.")
+
+
+shard_pool = ShardPool()
@@ -3,7 +3,7 @@ import os
 import asyncio
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
 STATE_FILE = "stats.json"
 TMP_STATE_FILE = "stats.json.tmp"
@@ -11,6 +11,8 @@ TMP_STATE_FILE = "stats.json.tmp"
 class StateManager:
     def __init__(self):
         self._dirty = False
+        # V7 SHARD: worker processes keep a private, in-memory copy (the API process owns stats.json)
+        self.persist = True
         self._task = None
         self._lock = asyncio.Lock()
         self._stats = {
@@ -51,6 +53,8 @@ class StateManager:
                     self._save_sync()
 
     def _mark_dirty(self):
+        if not self.persist:
+            return
         self._dirty = True
         try:
             loop = asyncio.get_running_loop()
@@ -61,6 +65,8 @@ class StateManager:
 
     def flush_immediate(self):
         """Immediately force-save state to disk (Critical for report readiness)."""
+        if not self.persist:
+            return
         asyncio.run_coroutine_threadsafe(self._async_save(), asyncio.get_event_loop()) if self._task else self._save_sync()
 
     async def _async_save(self):
@@ -138,7 +144,7 @@ class StateManager:
         self._save()
 
         
-    def complete_scan(self, scan_id: str, results: List[Any], duration: float):
+    def complete_scan(self, scan_id: str, results: Iterable[Any], duration: float):
         self._stats["active_scans"] = max(0, self._stats["active_scans"] - 1)
         
         # Clean up ephemeral signatures for this scan
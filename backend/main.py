@@ -43,6 +43,14 @@ async def lifespan(app: FastAPI):
     print("Antigravity IDE operational. Triple-Pillar Governance active.\n")
     yield
 
+    # --- SHUTDOWN: stop shard workers (no-op when HIVE_SHARDS = 0) ---
+    from backend.core.shard import shard_pool
+    await shard_pool.shutdown()
+
+    # --- SHUTDOWN: release the shared Cortex connection pool ---
+    from backend.ai.cortex import CortexEngine
+    await CortexEngine.shared().close()
+
 app = FastAPI(title="Antigravity", lifespan=lifespan)
 
 # CORS to allow Chrome Extension and Frontend
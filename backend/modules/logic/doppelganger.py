@@ -3,9 +3,9 @@ import difflib
 from backend.core.base import BaseArsenalModule
 from backend.core.protocol import JobPacket, ResultPacket, Vulnerability, TaskTarget
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
-cortex = CortexEngine()
+cortex = CortexHandle("doppelganger")
 
 class Doppelganger(BaseArsenalModule):
     """
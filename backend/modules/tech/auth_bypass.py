@@ -1,9 +1,9 @@
 from backend.core.base import BaseArsenalModule
 from backend.core.protocol import JobPacket, ResultPacket, Vulnerability, TaskTarget
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
-cortex = CortexEngine()
+cortex = CortexHandle("auth_bypass")
 
 class AuthBypassTester(BaseArsenalModule):
     def __init__(self):
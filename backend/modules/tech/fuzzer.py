@@ -1,6 +1,6 @@
 from backend.core.base import BaseArsenalModule
 from backend.core.protocol import JobPacket, ResultPacket, Vulnerability, TaskTarget
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 import aiohttp
 import time
 
@@ -10,7 +10,7 @@ class APIFuzzer(BaseArsenalModule):
         self.name = "API Fuzzer"
         # CORTEX AI for intelligent vector generation
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
 
@@ -2,9 +2,9 @@ from backend.core.base import BaseArsenalModule
 from backend.core.protocol import JobPacket, ResultPacket, Vulnerability, TaskTarget
 import time
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 
-cortex = CortexEngine()
+cortex = CortexHandle("jwt")
 
 class JWTTokenCracker(BaseArsenalModule):
     def __init__(self):
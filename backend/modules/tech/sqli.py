@@ -1,6 +1,6 @@
 from backend.core.base import BaseArsenalModule
 from backend.core.protocol import JobPacket, ResultPacket, Vulnerability, TaskTarget
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle
 import aiohttp
 import time
 import urllib.parse
@@ -11,7 +11,7 @@ class SQLInjectionProbe(BaseArsenalModule):
         self.name = "SQL Injection Probe"
         # CORTEX AI for intelligent payload generation
         try:
-            self.ai = CortexEngine()
+            self.ai = CortexHandle(self.name)
         except:
             self.ai = None
 
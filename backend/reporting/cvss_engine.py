@@ -1,7 +1,7 @@
 # Hybrid AI Engine
-from backend.ai.cortex import CortexEngine
+from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
 
-cortex = CortexEngine()
+cortex = CortexHandle("cvss_engine", priority=PRIORITY_REPORT)
 
 class CVSSCalculator:
     def __init__(self, success_count: int, body_content: str = "", target_url: str = "", vuln_type: str = ""):
@@ -182,8 +182,8 @@ class ForensicReport(FPDF):
         
         summary = None
         try:
-            from backend.ai.cortex import CortexEngine
-            cortex = CortexEngine()
+            from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
+            cortex = CortexHandle("pdf_maker", priority=PRIORITY_REPORT)
             target = job_data.get('target', 'Unknown')
             success_count = sum(1 for r in results if isinstance(r, dict) and str(r.get('status', '')).startswith('2'))
             summary = cortex.generate_executive_brief(target, success_count, len(results), "0.0")
@@ -222,8 +222,8 @@ class ForensicReport(FPDF):
         # Initialize Cortex if key available
         cortex = None
         try:
-            from backend.ai.cortex import CortexEngine
-            cortex = CortexEngine()
+            from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
+            cortex = CortexHandle("pdf_maker", priority=PRIORITY_REPORT)
         except:
             pass
 
@@ -262,8 +262,8 @@ class ForensicReport(FPDF):
                 else:
                     # Fallback to Neural Core
                     try:
-                        from backend.ai.cortex import CortexEngine
-                        hybrid = CortexEngine()
+                        from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
+                        hybrid = CortexHandle("pdf_maker", priority=PRIORITY_REPORT)
                         vuln_data = {
                             "target": job_data.get('target'),
                             "payload": payload,
@@ -377,8 +377,8 @@ class ForensicReport(FPDF):
             
             summary = None
             try:
-                from backend.ai.cortex import CortexEngine
-                cortex = CortexEngine()
+                from backend.ai.cortex import CortexHandle, PRIORITY_REPORT
+                cortex = CortexHandle("pdf_maker", priority=PRIORITY_REPORT)
                 success_count = sum(1 for r in scan['results'] if isinstance(r, dict) and str(r.get('status', '')).startswith('2'))
                 summary = cortex.generate_executive_brief(target_title, success_count, len(scan['results']), "0.0")
             except:
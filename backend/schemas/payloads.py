@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Dict, Optional, Any
 
+from backend.core.scheduler import PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
 class ReconPayload(BaseModel):
     url: str
     method: str
@@ -27,3 +29,4 @@ class AttackPayload(BaseModel):
     modules: list[str] = []
     filters: list[str] = []
     duration: Optional[int] = 180  # Default 3 mins
+    priority: int = Field(PRIORITY_NORMAL, ge=PRIORITY_HIGH, le=PRIORITY_LOW)  # Scheduler queue priority (0 = first)
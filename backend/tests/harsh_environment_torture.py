@@ -40,7 +40,7 @@ class ChaosEventBus(EventBus):
         }
         self.split_brain_buffer = []
 
-    async def publish(self, event: HiveEvent):
+    async def publish(self, event: HiveEvent, throttle: bool = False):
         # Intercept CONTROL_SIGNAL to simulate Orchestrator cancellations
         if event.type == EventType.CONTROL_SIGNAL:
             signal = event.payload.get("signal")
@@ -67,7 +67,7 @@ class ChaosEventBus(EventBus):
             await asyncio.sleep(self.chaos_config["throttle_delay"])
 
         # Call the absolute integrity implementation (queues causally to ScanContext)
-        await super().publish(event)
+        await super().publish(event, throttle=throttle)
 
     async def _delayed_publish(self, event: HiveEvent):
         # Induces 100-500ms lag before attempting to enter the Strict Queue, simulating out-of-order network arrival.
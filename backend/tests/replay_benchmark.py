@@ -0,0 +1,169 @@
+"""
+Antigravity V7 — Event Replay Benchmark
+=======================================
+Replays a recorded scan journal (journals/<scan_id>.journal) through a fresh
+EventBus and reports per-event-type end-to-end latency and throughput.
+
+Ollama and the scanned target are replaced by local stub servers, so runs are
+repeatable and a slower build shows up as a latency regression, not noise.
+
+Usage:
+    python backend/tests/replay_benchmark.py                       # synthetic journal, bus only
+    python backend/tests/replay_benchmark.py journals/HIVE-V5-1.journal --speed 10
+    python backend/tests/replay_benchmark.py journals/HIVE-V5-1.journal --speed max --agents
+
+Modes:
+    default   replay every recorded event into the bus (handler/bus overhead)
+    --agents  start the real agent set and replay only Orchestrator seed events;
+              the agents regenerate the rest against the stubs
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+# Add project root to path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+STUB_HOST = "127.0.0.1"
+OLLAMA_STUB_PORT = 18434
+TARGET_STUB_PORT = 18080
+
+# Must be set before any backend import creates a CortexEngine
+os.environ["OLLAMA_BASE_URL"] = f"http://{STUB_HOST}:{OLLAMA_STUB_PORT}"
+
+from backend.core.hive import EventBus, EventType, HiveEvent
+from backend.core.journal import EventJournal
+from backend.core.replay import ReplayEngine
+
+# ==========================================================
+# STUB SERVERS
+# ==========================================================
+
+async def ollama_generate(request):
+    """Minimal /api/generate: one streamed chunk plus the final stats line."""
+    await request.json()
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    await response.write((json.dumps({"response": "0.5", "done": False}) + "\n").encode())
+    await response.write((json.dumps({"response": "", "done": True, "eval_count": 1, "prompt_eval_count": 32}) + "\n").encode())
+    await response.write_eof()
+    return response
+
+
+async def target_any(request):
+    return web.json_response({"status": "ok", "path": request.path})
+
+
+async def start_stubs():
+    runners = []
+    for port, routes in (
+        (OLLAMA_STUB_PORT, [web.post("/api/generate", ollama_generate)]),
+        (TARGET_STUB_PORT, [web.route("*", "/{tail:.*}", target_any)]),
+    ):
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, STUB_HOST, port).start()
+        runners.append(runner)
+    return runners
+
+# ==========================================================
+# SYNTHETIC JOURNAL (when no recording is given)
+# ==========================================================
+
+def synthesize_journal(directory: str, events: int = 2000) -> EventJournal:
+    journal = EventJournal("SYNTHETIC-REPLAY", directory=directory)
+    start = datetime.utcnow()
+    mix = [EventType.LIVE_ATTACK, EventType.LOG, EventType.LIVE_ATTACK, EventType.VULN_CANDIDATE, EventType.VULN_CONFIRMED]
+    journal.append(HiveEvent(type=EventType.TARGET_ACQUIRED, source="Orchestrator", timestamp=start,
+                             payload={"url": "http://target.local/", "tech_stack": ["Unknown"]}))
+    for i in range(events):
+        etype = mix[i % len(mix)]
+        journal.append(HiveEvent(
+            type=etype,
+            source="agent_sigma",
+            timestamp=start + timedelta(milliseconds=5 * (i + 1)),
+            payload={"url": f"http://target.local/api/item/{i % 40}", "action": "Probe", "type": "IDOR", "data": {"i": i}},
+        ))
+    journal.close()
+    return journal
+
+
+def build_agents(bus: EventBus):
+    from backend.agents.alpha import AlphaAgent
+    from backend.agents.beta import BetaAgent
+    from backend.agents.gamma import GammaAgent
+    from backend.agents.omega import OmegaAgent
+    from backend.agents.zeta import ZetaAgent
+    from backend.agents.sigma import SigmaAgent
+    from backend.agents.kappa import KappaAgent
+    from backend.agents.sentinel import AgentTheta
+    from backend.agents.inspector import AgentIota
+    from backend.core.planner import MissionPlanner
+    agents = [AlphaAgent(bus), BetaAgent(bus), GammaAgent(bus), OmegaAgent(bus), ZetaAgent(bus),
+              SigmaAgent(bus), KappaAgent(bus), AgentTheta(bus), AgentIota(bus), MissionPlanner(bus)]
+    for agent in agents:
+        agent.mission_config = {"modules": [], "filters": [], "scope": f"http://{STUB_HOST}:{TARGET_STUB_PORT}"}
+    return agents
+
+# ==========================================================
+# MAIN
+# ==========================================================
+
+async def main(path, speed, with_agents, drain_timeout):
+    runners = await start_stubs()
+    tmpdir = tempfile.mkdtemp(prefix="replay-")
+    try:
+        journal = EventJournal.open(path) if path else synthesize_journal(tmpdir)
+        bus = EventBus()
+        if not with_agents:
+            async def sink(event):
+                await asyncio.sleep(0)
+            for etype in EventType:
+                bus.subscribe(etype, sink)
+
+        engine = ReplayEngine(
+            journal,
+            bus=bus,
+            agents=build_agents(bus) if with_agents else None,
+            speed=speed,
+            sources={"Orchestrator"} if with_agents else None,
+            rebase_url=f"http://{STUB_HOST}:{TARGET_STUB_PORT}",
+        )
+        print(f">>> Replaying {len(journal)} recorded events from {journal.path} (speed={speed or 'max'}, agents={with_agents})")
+        report = await engine.run(drain_timeout=drain_timeout)
+        await bus.shutdown()
+
+        print("\n" + "=" * 72)
+        print(f"Replayed {report['replayed']} | generated {report['generated']} | skipped {report['skipped']} | drained={report['drained']}")
+        print(f"Wall {report['wall_s']}s | replay {report['replay_throughput_eps']} ev/s | handled {report['handled_throughput_eps']} ev/s")
+        print("-" * 72)
+        print(f"{'EVENT TYPE':<18}{'COUNT':>8}{'AVG ms':>10}{'P50 ms':>10}{'P95 ms':>10}{'MAX ms':>10}")
+        for etype, row in report["latency"].items():
+            print(f"{etype:<18}{row['count']:>8}{row['avg_ms']:>10}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['max_ms']:>10}")
+        print("=" * 72)
+        return report["drained"]
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Antigravity V7 Event Replay Benchmark")
+    parser.add_argument("journal", nargs="?", help="Path to a recorded .journal (default: synthetic)")
+    parser.add_argument("--speed", default="max", help="Replay speed multiplier, e.g. 1, 10 or 'max' (default: max)")
+    parser.add_argument("--agents", action="store_true", help="Run the real agent set against the stubs")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to wait for the hive to settle")
+    args = parser.parse_args()
+    speed = None if args.speed == "max" else float(args.speed)
+    success = asyncio.run(main(args.journal, speed, args.agents, args.drain_timeout))
+    sys.exit(0 if success else 1)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import random
+import time
+from backend.core.hive import EventBus, EventType, HiveEvent
+from backend.core.context import LanedEventQueue, DedupWindow
+from backend.core.protocol import JobPacket, TaskTarget, ModuleConfig, AgentID
+
+# Configure Logging
+logger = logging.getLogger("BusSemanticsTest")
+logger.setLevel(logging.INFO)
+sh = logging.StreamHandler()
+sh.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+logger.addHandler(sh)
+
+SCAN = "BUS-SEMANTICS"
+
+
+def event(event_type: EventType, url: str = None, scan_id: str = SCAN, **payload) -> HiveEvent:
+    if url is not None:
+        payload["url"] = url
+    return HiveEvent(type=event_type, source="test", payload=payload, scan_id=scan_id)
+
+
+def job(agent_id: AgentID, url: str) -> HiveEvent:
+    packet = JobPacket(
+        target=TaskTarget(url=url, method="GET"),
+        config=ModuleConfig(module_id="probe", agent_id=agent_id)
+    )
+    return HiveEvent(type=EventType.JOB_ASSIGNED, source="test", payload=packet.model_dump(), scan_id=SCAN)
+
+
+async def check_lane_ordering() -> bool:
+    """Same (handler, target) lane stays FIFO in parallel mode; other targets overlap."""
+    bus = EventBus(dispatch_mode="parallel")
+    seen = {}
+    active = 0
+    peak = 0
+
+    async def handler(e: HiveEvent):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(random.uniform(0.001, 0.01))
+        seen.setdefault(e.payload["url"], []).append(e.payload["n"])
+        active -= 1
+
+    bus.subscribe(EventType.VULN_CANDIDATE, handler)
+    bus.subscribe(EventType.VULN_CONFIRMED, handler)
+    for n in range(30):
+        url = f"http://target.local/{n % 3}"
+        kind = EventType.VULN_CONFIRMED if n % 5 == 4 else EventType.VULN_CANDIDATE
+        await bus.publish(event(kind, url, n=n))
+    await bus.wait_for_quiescence(10, grace=0.05, poll=0.01)
+
+    ordered = all(seq == sorted(seq) and len(seq) == 10 for seq in seen.values())
+    logger.info(f"lanes={ {u: len(s) for u, s in seen.items()} } peak_parallel={peak}")
+    return ordered and peak > 1
+
+
+async def check_max_concurrency() -> bool:
+    bus = EventBus(dispatch_mode="parallel")
+    active = 0
+    peak = 0
+
+    async def handler(e: HiveEvent):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    bus.subscribe(EventType.VULN_CANDIDATE, handler, max_concurrency=2)
+    for n in range(20):
+        await bus.publish(event(EventType.VULN_CANDIDATE, f"http://target.local/{n}"))
+    await bus.wait_for_quiescence(10, grace=0.05, poll=0.01)
+    logger.info(f"max_concurrency=2 peak={peak}")
+    return peak == 2
+
+
+async def check_dedup_window() -> bool:
+    window = DedupWindow(size=3, ttl=None)
+    for event_id in ("a", "b", "c", "d"):
+        window.add(event_id)
+    count_ok = "a" not in window and all(i in window for i in ("b", "c", "d"))
+
+    aged = DedupWindow(size=10, ttl=0.05)
+    aged.add("x")
+    await asyncio.sleep(0.1)
+    ttl_ok = "x" not in aged
+
+    # A re-published event id is dropped by the scan's window
+    bus = EventBus(dispatch_mode="parallel")
+    calls = []
+
+    async def handler(e: HiveEvent):
+        calls.append(e.id)
+
+    bus.subscribe(EventType.VULN_CANDIDATE, handler)
+    e = event(EventType.VULN_CANDIDATE, "http://target.local/dup")
+    await bus.publish(e)
+    await bus.publish(e)
+    await bus.wait_for_quiescence(5, grace=0.05, poll=0.01)
+    logger.info(f"evicted_oldest={count_ok} ttl_expired={ttl_ok} duplicate_calls={len(calls)}")
+    return count_ok and ttl_ok and len(calls) == 1
+
+
+async def check_lane_shedding() -> bool:
+    queue = LanedEventQueue(maxsize=3, telemetry_capacity=2)
+    queue.put_nowait(event(EventType.LOG, message="same"))
+    queue.put_nowait(event(EventType.LOG, message="same"))  # Coalesced with the first
+    queue.put_nowait(event(EventType.LOG, message="second"))
+    queue.put_nowait(event(EventType.LOG, message="third"))  # Sheds "same"
+    coalesced_ok = queue.stats["coalesced"] == 1 and queue.stats["shed"] == 1
+
+    queue.put_nowait(event(EventType.VULN_CANDIDATE, "http://target.local/a"))
+    queue.put_nowait(event(EventType.VULN_CONFIRMED, "http://target.local/a"))
+    accepted = queue.put_nowait(event(EventType.JOB_COMPLETED, "http://target.local/a"))  # Over the bound: kept
+    shed = queue.put_nowait(event(EventType.LOG, message="late"))  # Backlog full: telemetry goes first
+    bound_ok = not accepted and not shed and queue.pressure >= 1.0
+
+    order = []
+    while not queue.empty():
+        e = await queue.get()
+        order.append(e.type.value if e.type != EventType.LOG else e.payload["message"])
+        queue.task_done(e)
+    # Critical events keep arrival order with main events; telemetry drains last
+    order_ok = order == ["VULN_CANDIDATE", "VULN_CONFIRMED", "JOB_COMPLETED", "second", "third"]
+    logger.info(f"drain_order={order} stats={queue.stats}")
+    return coalesced_ok and bound_ok and order_ok and queue.pressure == 0.0
+
+
+async def check_inflight_backpressure() -> bool:
+    """Dispatched-but-unfinished events hold their slot, so throttled producers wait."""
+    bus = EventBus(dispatch_mode="parallel")
+    release = asyncio.Event()
+
+    async def handler(e: HiveEvent):
+        await release.wait()
+
+    bus.subscribe(EventType.VULN_CANDIDATE, handler, max_concurrency=100)
+    ctx = bus.get_or_create_context(SCAN)
+    ctx.event_queue.maxsize = 5
+    for n in range(5):
+        await bus.publish(event(EventType.VULN_CANDIDATE, f"http://target.local/{n}"))
+    await asyncio.sleep(0.05)
+    saturated = bus.backpressure(SCAN) >= 1.0 and ctx.event_queue.qsize() == 0
+    waited = not await bus.wait_for_capacity(SCAN, timeout=0.1)
+    release.set()
+    drained = await bus.wait_for_capacity(SCAN, timeout=1.0)
+    await bus.wait_for_quiescence(5, grace=0.05, poll=0.01)
+    logger.info(f"saturated={saturated} producer_parked={waited} released={drained}")
+    return saturated and waited and drained and bus.backpressure(SCAN) == 0.0
+
+
+async def check_routing() -> bool:
+    bus = EventBus(dispatch_mode="parallel")
+    received = {"beta": 0, "gamma": 0, "broadcast": 0, "filtered": 0}
+
+    async def beta(e):
+        received["beta"] += 1
+
+    async def gamma(e):
+        received["gamma"] += 1
+
+    async def broadcast(e):
+        received["broadcast"] += 1
+
+    async def filtered(e):
+        received["filtered"] += 1
+
+    async def broken(e):
+        pass
+
+    bus.subscribe(EventType.JOB_ASSIGNED, beta, route_key=AgentID.BETA)
+    bus.subscribe(EventType.JOB_ASSIGNED, gamma, route_key=AgentID.GAMMA)
+    bus.subscribe(EventType.JOB_ASSIGNED, broadcast)
+    bus.subscribe(EventType.VULN_CANDIDATE, filtered, predicate=lambda e: e.payload.get("url", "").endswith("/admin"))
+    bus.subscribe(EventType.VULN_CANDIDATE, broken, predicate=lambda e: e.payload["missing"])  # Raises: not matched
+
+    await bus.publish(job(AgentID.BETA, "http://target.local/a"))
+    await bus.publish(job(AgentID.BETA, "http://target.local/b"))
+    await bus.publish(job(AgentID.GAMMA, "http://target.local/c"))
+    await bus.publish(event(EventType.VULN_CANDIDATE, "http://target.local/admin"))
+    await bus.publish(event(EventType.VULN_CANDIDATE, "http://target.local/home"))
+    await bus.wait_for_quiescence(5, grace=0.05, poll=0.01)
+    loop_alive = not bus._context_tasks[SCAN].done()
+    logger.info(f"received={received} loop_alive={loop_alive}")
+    return received == {"beta": 2, "gamma": 1, "broadcast": 3, "filtered": 1} and loop_alive
+
+
+async def check_quiescence() -> bool:
+    bus = EventBus(dispatch_mode="parallel")
+
+    async def candidate(e):
+        await asyncio.sleep(0.2)
+        await bus.publish(event(EventType.VULN_CONFIRMED, e.payload["url"]))
+
+    async def confirmed(e):
+        await asyncio.sleep(0.2)
+
+    bus.subscribe(EventType.VULN_CANDIDATE, candidate)
+    bus.subscribe(EventType.VULN_CONFIRMED, confirmed)
+
+    start = time.monotonic()
+    await bus.publish(event(EventType.VULN_CANDIDATE, "http://target.local/q"))
+    quiet = await bus.wait_for_quiescence(5, grace=0.05, poll=0.01)
+    elapsed = time.monotonic() - start
+    # The follow-up chain must finish first; an upper bound shorter than the chain times out
+    await bus.publish(event(EventType.VULN_CANDIDATE, "http://target.local/r"))
+    timed_out = not await bus.wait_for_quiescence(0.1, grace=0.05, poll=0.01)
+    await bus.wait_for_quiescence(5, grace=0.05, poll=0.01)
+    logger.info(f"quiet={quiet} after={elapsed:.2f}s short_timeout_reported={timed_out}")
+    return quiet and elapsed >= 0.4 and timed_out
+
+
+async def test_eventbus_semantics():
+    logger.info("--- [START] EVENT BUS SEMANTICS TEST ---")
+    checks = {
+        "LANE_ORDERING": check_lane_ordering,
+        "MAX_CONCURRENCY": check_max_concurrency,
+        "DEDUP_WINDOW": check_dedup_window,
+        "LANE_SHEDDING": check_lane_shedding,
+        "INFLIGHT_BACKPRESSURE": check_inflight_backpressure,
+        "ROUTING": check_routing,
+        "QUIESCENCE": check_quiescence,
+    }
+    results = {}
+    for name, check in checks.items():
+        try:
+            results[name] = await check()
+        except Exception as e:
+            logger.error(f"{name} raised {e!r}")
+            results[name] = False
+        logger.info(f"[{'OK' if results[name] else 'FAIL'}] {name}")
+
+    logger.info("--- [RESULTS] ---")
+    logger.info(results)
+    if all(results.values()):
+        logger.info("[SUCCESS] EVENT BUS SEMANTICS VERIFIED")
+    else:
+        logger.error("[FAIL] EVENT BUS SEMANTICS BROKEN")
+
+if __name__ == "__main__":
+    asyncio.run(test_eventbus_semantics())